@@ -5,9 +5,15 @@ This module contains the main logic for finding and organizing media files.
 """
 
 import os
+import errno
 import shutil
+import stat
 import logging
+import logging.handlers
+import multiprocessing
 import threading
+import functools
+import contextlib
 from pathlib import Path
 from datetime import datetime
 import json
@@ -18,10 +24,258 @@ from media_file import MediaFile
 import defaults
 # Import the extensions module
 import extensions
+# Import the metadata cache module
+import metadata_cache
 
 # Configure logging
 logger = logging.getLogger("Archimedius")
 
+# Bytes requested per copy_file_range call
+COPY_CHUNK_SIZE = 1 << 30
+
+# macOS writes a "._" resource fork file next to each file copied to a non-Apple
+# filesystem; they share the media file's extension but hold no media
+_APPLEDOUBLE_PREFIX = "._"
+
+# Cleared once the kernel reports copy_file_range as unavailable (ENOSYS, e.g. old
+# kernels or sandboxes that filter the syscall), so later copies don't retry it
+_use_copy_file_range = hasattr(os, "copy_file_range")
+
+
+def copy_file(src, dst, src_stat=None):
+    """
+    Copy a file with its metadata, like shutil.copy2, keeping the data copy in the kernel.
+
+    On Linux, os.copy_file_range lets the filesystem clone or server-side copy the
+    data (btrfs/XFS reflinks, NFS 4.2). Elsewhere, or if it is not supported for
+    these files, shutil.copyfile is used, which already relies on sendfile/fcopyfile.
+
+    Args:
+        src: Source file path
+        dst: Destination file path
+        src_stat: Optional stat result of src; when given, the permission bits and
+            timestamps are copied from it instead of calling stat() on src again
+
+    Returns:
+        The destination path
+    """
+    global _use_copy_file_range
+    if _use_copy_file_range:
+        try:
+            _copy_file_range(src, dst)
+        except OSError as e:
+            if e.errno == errno.ENOSYS:
+                _use_copy_file_range = False
+            shutil.copyfile(src, dst)
+    else:
+        shutil.copyfile(src, dst)
+    if src_stat is None:
+        shutil.copystat(src, dst)
+    else:
+        os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        os.chmod(dst, stat.S_IMODE(src_stat.st_mode))
+    return dst
+
+
+def is_copy_current(dst, src_stat):
+    """
+    Check whether dst already holds a copy of a file, judging by size and modification time.
+
+    copy_file gives the copy the source's modification time, so an earlier run's copy
+    matches; the 2 second tolerance covers filesystems with coarse timestamps (FAT).
+
+    Args:
+        dst: Destination file path
+        src_stat: Stat result of the source file, or None if unknown
+
+    Returns:
+        True if dst exists with the same size and modification time as the source
+    """
+    if src_stat is None:
+        return False
+    try:
+        dst_stat = os.stat(dst)
+    except OSError:
+        return False
+    return dst_stat.st_size == src_stat.st_size and abs(dst_stat.st_mtime - src_stat.st_mtime) < 2
+
+
+def move_file(src, dst):
+    """
+    Move a file, renaming it in place when source and destination share a filesystem.
+
+    A rename moves no data, so it is tried first; copy_file followed by removing the
+    source is only used when the destination is on another device. os.replace is used
+    rather than os.rename so an existing destination is overwritten on Windows too, as
+    it is when copying.
+
+    Args:
+        src: Source file path
+        dst: Destination file path
+
+    Returns:
+        The destination path
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        copy_file(src, dst)
+        os.unlink(src)
+    return dst
+
+
+@functools.lru_cache(maxsize=None)
+def is_rotational_device(device):
+    """
+    Check whether a device is a spinning disk, where parallel reads cause heavy seeking.
+
+    Only Linux reports this (through sysfs); elsewhere, and for network or virtual
+    filesystems, devices are treated as solid state.
+
+    Args:
+        device: Device number (st_dev of a file on it)
+
+    Returns:
+        True if the device is known to be rotational
+    """
+    if not hasattr(os, "major"):
+        return False
+    block = f"/sys/dev/block/{os.major(device)}:{os.minor(device)}"
+    # Partitions have no queue of their own; the disk's is one level up
+    for queue in (os.path.join(block, "queue"), os.path.join(block, "..", "queue")):
+        try:
+            with open(os.path.join(queue, "rotational")) as f:
+                return f.read().strip() == "1"
+        except OSError:
+            continue
+    return False
+
+
+def _copy_file_range(src, dst):
+    """Copy file data with os.copy_file_range until the end of the source file."""
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        in_fd = fsrc.fileno()
+        out_fd = fdst.fileno()
+        while os.copy_file_range(in_fd, out_fd, COPY_CHUNK_SIZE):
+            pass
+
+
+class _ForwardedLogHandler(logging.Handler):
+    """Pass records received from worker processes to the matching logger in this process."""
+
+    def emit(self, record):
+        record_logger = logging.getLogger(record.name)
+        if record_logger.isEnabledFor(record.levelno):
+            record_logger.handle(record)
+
+
+def init_worker_logging(log_queue, levels):
+    """
+    Send a worker process's log records to the parent process.
+
+    Used as a process pool initializer; handlers inherited from or rebuilt by the
+    parent's setup would only write into queues nobody reads in the worker.
+
+    Args:
+        log_queue: multiprocessing queue read by worker_log_forwarding in the parent
+        levels: Levels set in the parent by logger name, with "" for the root logger;
+            spawned workers start with none of them
+    """
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    for name, level in levels.items():
+        logging.getLogger(name or None).setLevel(level)
+
+
+def _logger_levels():
+    """Get the levels set on the root logger and on named loggers, by logger name."""
+    levels = {"": logging.getLogger().level}
+    for name, named_logger in logging.root.manager.loggerDict.items():
+        # Placeholders stand in for parents of named loggers and have no level
+        if isinstance(named_logger, logging.Logger) and named_logger.level != logging.NOTSET:
+            levels[name] = named_logger.level
+    return levels
+
+
+@contextlib.contextmanager
+def worker_log_forwarding(mp_context=None):
+    """
+    Forward log records from worker processes to this process's loggers while active.
+
+    Args:
+        mp_context: Optional multiprocessing context the pool will use
+
+    Yields:
+        Keyword arguments (initializer and initargs) for ProcessPoolExecutor; the
+        pool must be shut down before the context exits
+    """
+    log_queue = (mp_context or multiprocessing).Queue()
+    listener = logging.handlers.QueueListener(log_queue, _ForwardedLogHandler())
+    listener.start()
+    try:
+        yield {"initializer": init_worker_logging, "initargs": (log_queue, _logger_levels())}
+    finally:
+        # Stopping drains the records still in the queue
+        listener.stop()
+        log_queue.close()
+
+
+def plan_file(
+    file_path,
+    supported_extensions,
+    extension_map,
+    fields_by_type,
+    templates,
+    exclude_unknown_by_type,
+    cache_file=None,
+):
+    """
+    Read a file's metadata and work out its destination relative to the output directory.
+
+    This is a plain function so it can run in a worker process; tag parsing is
+    pure Python and would otherwise hold the GIL.
+
+    Args:
+        file_path: Path of the source file
+        supported_extensions: Supported extensions by media type
+        extension_map: Extension to media type lookup for supported_extensions
+        fields_by_type: Metadata fields used by the template of each media type
+        templates: Template for each media type
+        exclude_unknown_by_type: exclude_unknown setting for each media type
+        cache_file: Optional metadata cache database; metadata stored there for the
+            file's current size and modification time is used instead of reading the file
+
+    Returns:
+        Tuple of (relative destination path, stat result of the file or None, cache entry
+        to store with MetadataCache.put_many or None)
+    """
+    cache = metadata_cache.get_cache(cache_file) if cache_file is not None else None
+    media_file = MediaFile(file_path, supported_extensions, extension_map, fields_by_type, cache)
+    template = templates.get(media_file.file_type, templates["audio"])
+    exclude_unknown = exclude_unknown_by_type.get(media_file.file_type, False)
+    rel_path = media_file.get_formatted_path(template, exclude_unknown=exclude_unknown)
+    return rel_path, media_file.file_stat, media_file.cache_entry
+
+
+class ScanProgress:
+    """
+    Counts for one walk of a source directory.
+
+    Each walk gets its own, so a preview scanning the source can't change the counts
+    an organize run is reporting.
+    """
+
+    def __init__(self):
+        # Files yielded so far
+        self.files_discovered = 0
+        # Number of files found, set once the walk is finished
+        self.total_files = None
+
+
 class Archimedius:
     """Class for organizing media files based on metadata."""
     
@@ -38,6 +292,15 @@ class Archimedius:
         self.is_running = False
         self.stop_requested = False
         self.operation_mode = "copy"  # Default to copy mode
+        # Directories already created during the current run
+        self._created_dirs = set()
+        # (source_dir, output_dir) and the output directory relative to the source
+        self._output_relation = None
+        # Semaphore limiting concurrent transfers for each rotational source device
+        self._device_slots = {}
+        # [lock, number of holders and waiters] for each destination being written
+        self._destination_locks = {}
+        self._destination_locks_guard = threading.Lock()
     
     def set_source_dir(self, directory):
         """Set the source directory."""
@@ -46,7 +309,87 @@ class Archimedius:
     def set_output_dir(self, directory):
         """Set the output directory."""
         self.output_dir = Path(directory)
+        # Directories may have been removed since the last run
+        self._created_dirs = set()
+
+    def ensure_dir(self, directory):
+        """
+        Create a directory and its parents, skipping directories created earlier in the run.
+
+        Args:
+            directory: Directory path to create
+        """
+        directory = str(directory)
+        if directory not in self._created_dirs:
+            parent = os.path.dirname(directory)
+            if parent in self._created_dirs:
+                # Only the last level can be missing, so makedirs' checks of the
+                # parents are skipped (e.g. a new album next to an existing one)
+                try:
+                    os.mkdir(directory)
+                except FileExistsError:
+                    if not os.path.isdir(directory):
+                        raise
+            else:
+                os.makedirs(directory, exist_ok=True)
+            # set.add is atomic and creating an existing directory is tolerated,
+            # so worker threads can share the cache without a lock
+            self._created_dirs.add(directory)
+            self._created_dirs.add(parent)
     
+    def device_slot(self, file_stat):
+        """
+        Get a context manager to hold while transferring a file's data.
+
+        Spinning disks slow down sharply when several threads read from them at once,
+        so transfers from a rotational device are limited to ROTATIONAL_DEVICE_THREADS;
+        other devices are not limited.
+
+        Args:
+            file_stat: Stat result of the source file, or None if unknown
+
+        Returns:
+            A semaphore shared by transfers from the same device, or a no-op context
+        """
+        if file_stat is None or not is_rotational_device(file_stat.st_dev):
+            return contextlib.nullcontext()
+        slot = self._device_slots.get(file_stat.st_dev)
+        if slot is None:
+            slot = self._device_slots.setdefault(
+                file_stat.st_dev, threading.Semaphore(defaults.ROTATIONAL_DEVICE_THREADS)
+            )
+        return slot
+
+    @contextlib.contextmanager
+    def destination_lock(self, dest_path):
+        """
+        Hold a lock for a destination path while a file is written to it.
+
+        Templates can give files from different folders the same destination; without
+        the lock two worker threads could write to it at once and interleave their data.
+        Transfers to the same destination run one after the other instead, so the last
+        one wins as it would in a single-threaded run.
+
+        Args:
+            dest_path: Destination path of the file
+        """
+        # Compared case-insensitively where the filesystem is (normcase is a no-op on POSIX)
+        key = os.path.normcase(os.path.abspath(dest_path))
+        with self._destination_locks_guard:
+            entry = self._destination_locks.get(key)
+            if entry is None:
+                entry = self._destination_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            # Locks are dropped once unused, so only destinations in flight are kept
+            with self._destination_locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._destination_locks[key]
+
     def set_template(self, template, media_type=None):
         """
         Set the organization template.
@@ -92,4 +435,144 @@ class Archimedius:
     
     def stop(self):
         """Stop the organization process."""
-        self.stop_requested = True 
\ No newline at end of file
+        self.stop_requested = True
+
+    def create_parent_dirs(self, paths):
+        """
+        Create the parent directories for a batch of destination paths.
+
+        Each unique parent is created once, shallowest first, so later directories
+        only add a single level.
+
+        Args:
+            paths: Iterable of destination file paths
+        """
+        parents = {os.path.dirname(str(path)) for path in paths}
+        for parent in sorted(parents, key=lambda parent: parent.count(os.sep)):
+            try:
+                self.ensure_dir(parent)
+            except OSError as e:
+                logger.error(f"Error creating directory {parent}: {e}")
+
+    def is_output_inside_source(self):
+        """
+        Check whether the output directory is a true subdirectory of the source directory.
+
+        Returns:
+            True if files in the output directory would be found when scanning the source
+        """
+        return self._output_relative_to_source() is not None
+
+    def output_skip_prefix(self):
+        """
+        Get the path prefix shared by files in the output directory.
+
+        Paths found under the source directory that start with this prefix belong to
+        the output directory; a plain string comparison is enough to skip them.
+
+        Returns:
+            The output directory under the source directory, ending in a separator,
+            or None if the output directory is not inside the source directory
+        """
+        rel_output = self._output_relative_to_source()
+        if rel_output is None:
+            return None
+        return os.path.join(str(self.source_dir), rel_output, "")
+
+    def _output_relative_to_source(self):
+        """Return the output directory relative to the source directory, or None if outside it."""
+        if not self.source_dir or not self.output_dir:
+            return None
+        # Resolving follows symlinks with a stat per path component, which is slow on
+        # network drives, so the answer is kept while the directories stay the same
+        key = (self.source_dir, self.output_dir)
+        if self._output_relation is not None and self._output_relation[0] == key:
+            return self._output_relation[1]
+        try:
+            # Convert to absolute paths for comparison
+            abs_source = str(Path(self.source_dir).resolve())
+            abs_output = str(Path(self.output_dir).resolve())
+        except Exception as e:
+            logger.error(f"Error checking directory relationship: {e}")
+            return None
+        # A string prefix test avoids relative_to raising for every unrelated output;
+        # the trailing separator keeps /music from matching /music2, and the same
+        # directory is not a subdirectory
+        source_prefix = os.path.normcase(os.path.join(abs_source, ""))
+        if os.path.normcase(abs_output).startswith(source_prefix):
+            rel_output = Path(abs_output[len(source_prefix):])
+        else:
+            rel_output = None
+        self._output_relation = (key, rel_output)
+        return rel_output
+
+    def find_media_files(self, extensions):
+        """
+        Find media files in the source directory using a single directory walk.
+
+        Files in the output directory are skipped when it is inside the source directory.
+
+        Args:
+            extensions: Collection of file extensions to include (e.g. ".mp3")
+
+        Returns:
+            List of Path objects for the matching files
+        """
+        media_files = [Path(file_path) for file_path in self.iter_media_files(extensions)]
+        self.total_files = len(media_files)
+        return media_files
+
+    def iter_media_files(self, extensions, progress=None):
+        """
+        Yield media files in the source directory as they are found.
+
+        Args:
+            extensions: Collection of file extensions to include (e.g. ".mp3")
+            progress: Optional ScanProgress updated as the walk goes
+
+        Yields:
+            Path strings for the matching files; callers create Path objects only if needed
+        """
+        root = str(self.source_dir)
+        extensions = frozenset(ext.lower() for ext in extensions)
+
+        # The output directory is pruned so the walk never descends into it
+        skip_prefix = self.output_skip_prefix()
+        # Compared case-insensitively where the filesystem is (normcase is a no-op on POSIX)
+        skip_dir = os.path.normcase(skip_prefix[:-1]) if skip_prefix else None
+
+        if progress is None:
+            progress = ScanProgress()
+        pending_dirs = [root]
+        while pending_dirs:
+            directory = pending_dirs.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    matches = []
+                    for entry in entries:
+                        # The extension comes straight from the name, so it is checked
+                        # before asking for the entry type, which can cost a stat call
+                        # on filesystems that do not report it (e.g. some NFS mounts).
+                        # is_file also rules out sockets, FIFOs and device files.
+                        name = entry.name
+                        dot = name.rfind(".")
+                        if (
+                            dot > 0
+                            and name[dot:].lower() in extensions
+                            and not name.startswith(_APPLEDOUBLE_PREFIX)
+                            and entry.is_file()
+                        ):
+                            matches.append(entry.path)
+                        elif entry.is_dir(follow_symlinks=False):
+                            if skip_dir is None or os.path.normcase(entry.path) != skip_dir:
+                                pending_dirs.append(entry.path)
+            except OSError as e:
+                logger.warning(f"Could not scan directory {directory}: {e}")
+                continue
+
+            # Yield outside the scandir block so its handle is not held while consumers work
+            for file_path in matches:
+                progress.files_discovered += 1
+                yield file_path
+
+        progress.total_files = progress.files_discovered
\ No newline at end of file
@@ -5,9 +5,17 @@ Provides the main application window and user interface components.
 """
 
 import os
-import shutil
 import logging
+import multiprocessing
 import threading
+import functools
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from pathlib import Path
@@ -17,10 +25,19 @@ from ttkbootstrap import Style
 # Import application modules
 import extensions
 import defaults
+import metadata_cache
 from log_window import LogWindow
 from preferences_dialog import PreferencesDialog
-from media_file import MediaFile
-from archimedius import Archimedius
+from media_file import get_template_fields
+from archimedius import (
+    Archimedius,
+    ScanProgress,
+    copy_file,
+    is_copy_current,
+    move_file,
+    plan_file,
+    worker_log_forwarding,
+)
 from about_dialog import AboutDialog
 from help_dialog import HelpDialog
 
@@ -30,6 +47,72 @@ logger = logging.getLogger("Archimedius")
 # Initialize SUPPORTED_EXTENSIONS from the defaults module
 SUPPORTED_EXTENSIONS = defaults.get_default_extensions()
 
+# Media types with the title of their filter column and "All" checkbox
+MEDIA_TYPE_LABELS = (
+    ("audio", "Audio", "All Audio"),
+    ("video", "Video", "All Video"),
+    ("image", "Image", "All Images"),
+    ("ebook", "eBook", "All eBooks"),
+)
+
+# Placeholder help tables as (placeholder or template, description) pairs
+COMMON_PLACEHOLDERS = (
+    ("{filename}", "Original filename without extension"),
+    ("{extension}", "File extension (e.g., mp3, jpg)"),
+    ("{file_type}", "Type of file (audio, video, image, ebook)"),
+    ("{size}", "File size in bytes"),
+    ("{creation_date}", "File creation date (YYYY-MM-DD)"),
+    ("{creation_year}", "Year of file creation (YYYY)"),
+    ("{creation_month}", "Month of file creation (01-12)"),
+    ("{creation_month_name}", "Month name of file creation (January, February, etc.)"),
+)
+
+AUDIO_PLACEHOLDERS = (
+    ("{title}", "Song title"),
+    ("{artist}", "Artist name"),
+    ("{album}", "Album name"),
+    ("{year}", "Release year"),
+    ("{genre}", "Music genre"),
+    ("{track}", "Track number"),
+    ("{duration}", "Song duration"),
+    ("{bitrate}", "Audio bitrate"),
+)
+
+IMAGE_PLACEHOLDERS = (
+    ("{width}", "Image width in pixels"),
+    ("{height}", "Image height in pixels"),
+    ("{format}", "Image format (e.g., JPEG, PNG)"),
+    ("{camera_make}", "Camera manufacturer"),
+    ("{camera_model}", "Camera model"),
+    ("{date_taken}", "Date when the photo was taken"),
+)
+
+EBOOK_PLACEHOLDERS = (
+    ("{title}", "Book title"),
+    ("{author}", "Author name"),
+    ("{year}", "Publication year"),
+    ("{genre}", "Book genre"),
+)
+
+EXAMPLE_TEMPLATES = (
+    (
+        "{file_type}/{artist}/{album}/{filename}",
+        "Organizes by file type, then artist, then album",
+    ),
+    (
+        "Music/{year}/{artist} - {title}.{extension}",
+        "Organizes music by year, then artist-title",
+    ),
+    (
+        "{file_type}/{creation_year}/{creation_month_name}/{filename}",
+        "Organizes by file type, year, and month",
+    ),
+    (
+        "Photos/{creation_year}/{creation_month}/{filename}",
+        "Organizes photos by year and month number",
+    ),
+)
+
 class ArchimediusGUI:
     """GUI for the Archimedius application."""
     
@@ -53,13 +136,34 @@ class ArchimediusGUI:
         
         # Create variables for extension filters
         self.extension_vars = {"audio": {}, "video": {}, "image": {}, "ebook": {}}
+        # Extension selections as last read for saving, and the media types changed since
+        self._saved_extension_selections = {}
+        self._changed_extension_types = set()
         
         # Stored preview data for client-side re-filtering when extensions change
         self._full_preview_data = []
         self._full_preview_count = 0
+        # Preview file lists by (source, extensions, output), reused while the source is unchanged
+        self._preview_scan_cache = {}
+        # Pending after_idle call inserting the remaining preview rows
+        self._preview_insert_job = None
+        # Incremented for each auto-preview source check, so stale checks are ignored
+        self._preview_source_check = 0
+
+        # Latest progress from worker threads, shown by the next scheduled display update
+        self._pending_progress = None
+        self._progress_lock = threading.Lock()
         
         # Config file path
         self.config_file = Path.home() / defaults.DEFAULT_PATHS["settings_file"]
+        # Metadata read by earlier runs, so unchanged files are not parsed again
+        self.metadata_cache_file = str(Path.home() / defaults.DEFAULT_PATHS["metadata_cache_file"])
+
+        # Placeholders help dialog, built the first time it is shown
+        self._help_window = None
+        self._help_mousewheel = None
+        # Serialized settings last written to the config file, to skip unchanged saves
+        self._last_saved_settings = None
         
         # Create the main frame
         self.main_frame = ttk.Frame(self.root, padding=10)
@@ -91,6 +195,8 @@ class ArchimediusGUI:
 
         try:
             self.style.theme_use(theme_name)
+            # Style settings are per theme, so the shared extension style is set after each switch
+            self.style.configure("Ext.TCheckbutton", padding=0)
 
             # tk.Menu is not a ttk widget; keep it consistently light.
             menu_colors = {
@@ -100,6 +206,12 @@ class ArchimediusGUI:
                 "active_fg": "#111111",
             }
 
+            # Shade every other preview row; the tag is set once per theme, not per row
+            if hasattr(self, "preview_tree"):
+                self.preview_tree.tag_configure(
+                    "odd", background="#2b2b2b" if self.dark_mode else "#f6f6f6"
+                )
+
             if hasattr(self, "menubar"):
                 self.menubar.configure(
                     background=menu_colors["bg"],
@@ -139,6 +251,9 @@ class ArchimediusGUI:
         self.tools_menu = tk.Menu(self.menubar, tearoff=0)
         self.menubar.add_cascade(label="Tools", menu=self.tools_menu)
         self.tools_menu.add_command(label="View Logs", command=self._toggle_logs)
+        self.tools_menu.add_command(
+            label="Clear Metadata Cache", command=self._clear_metadata_cache
+        )
         
         # Help menu
         self.help_menu = tk.Menu(self.menubar, tearoff=0)
@@ -150,31 +265,35 @@ class ArchimediusGUI:
 
     def _create_widgets(self):
         """Create the GUI widgets."""
-        # Create a main container frame with three sections
-        # 1. Bottom section for progress and buttons (fixed height, packed first)
-        # 2. Top section for inputs (fixed height)
-        # 3. Middle section for preview (expandable)
+        # The main container is laid out with grid in two rows:
+        # 1. Top section for directories and the tabbed content (expandable)
+        # 2. Bottom section for progress and buttons (fixed height)
+        # Grid sizes each row in a single pass, unlike nested pack containers
+        self.main_frame.rowconfigure(0, weight=1)
+        self.main_frame.columnconfigure(0, weight=1)
         
         # Bottom section - fixed height for progress and buttons
-        # Pack this FIRST to ensure it's always at the bottom and visible
         bottom_frame = ttk.Frame(self.main_frame)
-        bottom_frame.pack(fill=tk.X, side=tk.BOTTOM, pady=2)
+        bottom_frame.grid(row=1, column=0, sticky=tk.EW, pady=2)
         
         # Set a minimum height for the bottom frame to ensure it's always visible
-        bottom_frame.pack_propagate(False)  # Prevent the frame from shrinking
+        bottom_frame.grid_propagate(False)  # Prevent the frame from shrinking
         bottom_frame.configure(height=150)  # Set minimum height
+        bottom_frame.columnconfigure(0, weight=1)
+        # The status bar row takes the spare height so it sits at the bottom
+        bottom_frame.rowconfigure(2, weight=1)
         
         # Progress frame
         progress_frame = ttk.LabelFrame(bottom_frame, text="Progress", padding=5)
-        progress_frame.pack(fill=tk.X, pady=2)
+        progress_frame.grid(row=0, column=0, sticky=tk.EW, pady=2)
 
-        self.progress_var = tk.DoubleVar()
+        self.progress_var = tk.IntVar()
         self.progress_bar = ttk.Progressbar(progress_frame, variable=self.progress_var, maximum=100)
         self.progress_bar.pack(fill=tk.X, pady=2)
         
         # Status bar
         status_frame = ttk.Frame(bottom_frame)
-        status_frame.pack(fill=tk.X, side=tk.BOTTOM, pady=2)
+        status_frame.grid(row=2, column=0, sticky="sew", pady=2)
         
         self.status_var = tk.StringVar()
         self.status_var.set("Ready")
@@ -188,7 +307,7 @@ class ArchimediusGUI:
 
         # Buttons frame
         buttons_frame = ttk.Frame(bottom_frame)
-        buttons_frame.pack(fill=tk.X, pady=3)
+        buttons_frame.grid(row=1, column=0, sticky=tk.EW, pady=3)
 
         # Replace single button with Copy and Move buttons
         self.copy_button = ttk.Button(
@@ -208,15 +327,18 @@ class ArchimediusGUI:
         
         # Top section frame - directories + tabbed content
         top_frame = ttk.Frame(self.main_frame)
-        top_frame.pack(fill=tk.BOTH, expand=True, pady=2, side=tk.TOP)
+        top_frame.grid(row=0, column=0, sticky=tk.NSEW, pady=2)
+        top_frame.rowconfigure(1, weight=1)
+        top_frame.columnconfigure(0, weight=1)
         
-        # Create a frame to hold both directory selection frames
+        # Create a frame to hold both directory selection frames side by side
         directories_frame = ttk.Frame(top_frame)
-        directories_frame.pack(fill=tk.X, pady=2)
+        directories_frame.grid(row=0, column=0, sticky=tk.EW, pady=2)
+        directories_frame.columnconfigure((0, 1), weight=1, uniform="directories")
 
         # Source directory selection
         self.source_frame = ttk.LabelFrame(directories_frame, text="Source Directory", padding=5)
-        self.source_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        self.source_frame.grid(row=0, column=0, sticky=tk.EW, padx=(0, 5))
         
         self.source_entry = ttk.Entry(self.source_frame)
         self.source_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
@@ -226,7 +348,7 @@ class ArchimediusGUI:
 
         # Output directory selection
         self.output_frame = ttk.LabelFrame(directories_frame, text="Output Directory", padding=5)
-        self.output_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+        self.output_frame.grid(row=0, column=1, sticky=tk.EW, padx=(5, 0))
 
         self.output_entry = ttk.Entry(self.output_frame)
         self.output_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
@@ -236,7 +358,7 @@ class ArchimediusGUI:
         
         # Tabbed content area for filters/templates/preview
         content_tabs = ttk.Notebook(top_frame)
-        content_tabs.pack(fill=tk.BOTH, expand=True, pady=2)
+        content_tabs.grid(row=1, column=0, sticky=tk.NSEW, pady=2)
 
         file_types_tab = ttk.Frame(content_tabs, padding=5)
         templates_tab = ttk.Frame(content_tabs, padding=5)
@@ -250,129 +372,18 @@ class ArchimediusGUI:
         content_tabs.select(preview_tab)
         self._create_preferences_tab(preferences_tab)
 
-        # Create a frame for each file type category
+        # Create a frame for each file type category, in equal-width grid columns
         self.file_types_frame = ttk.Frame(file_types_tab)
         self.file_types_frame.pack(fill=tk.X, pady=2)
-        
-        # Audio extensions
-        audio_frame = ttk.LabelFrame(self.file_types_frame, text="Audio")
-        audio_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
-        
-        # Create "Select All" checkbox for audio
-        self.audio_all_var = tk.BooleanVar(value=True)
-        audio_all_cb = ttk.Checkbutton(
-            audio_frame, 
-            text="All Audio", 
-            variable=self.audio_all_var,
-            command=lambda: self._toggle_all_extensions("audio"),
-        )
-        audio_all_cb.pack(anchor=tk.W)
-        
-        # Create individual checkboxes for audio extensions
-        audio_extensions_frame = ttk.Frame(audio_frame)
-        audio_extensions_frame.pack(fill=tk.X, padx=10)
-        
-        for i, ext in enumerate(SUPPORTED_EXTENSIONS["audio"]):
-            ext_name = ext.lstrip(".")
-            var = tk.BooleanVar(value=True)
-            self.extension_vars["audio"][ext] = var
-            cb = ttk.Checkbutton(
-                audio_extensions_frame, 
-                text=ext_name, 
-                variable=var,
-                command=self._update_extension_selection,
-            )
-            cb.grid(row=i // 2, column=i % 2, sticky=tk.W, padx=5)
-        
-        # Video extensions
-        video_frame = ttk.LabelFrame(self.file_types_frame, text="Video")
-        video_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
-        
-        # Create "Select All" checkbox for video
-        self.video_all_var = tk.BooleanVar(value=True)
-        video_all_cb = ttk.Checkbutton(
-            video_frame, 
-            text="All Video", 
-            variable=self.video_all_var,
-            command=lambda: self._toggle_all_extensions("video"),
-        )
-        video_all_cb.pack(anchor=tk.W)
-        
-        # Create individual checkboxes for video extensions
-        video_extensions_frame = ttk.Frame(video_frame)
-        video_extensions_frame.pack(fill=tk.X, padx=10)
-        
-        for i, ext in enumerate(SUPPORTED_EXTENSIONS["video"]):
-            ext_name = ext.lstrip(".")
-            var = tk.BooleanVar(value=True)
-            self.extension_vars["video"][ext] = var
-            cb = ttk.Checkbutton(
-                video_extensions_frame, 
-                text=ext_name, 
-                variable=var,
-                command=self._update_extension_selection,
-            )
-            cb.grid(row=i // 2, column=i % 2, sticky=tk.W, padx=5)
-        
-        # Image extensions
-        image_frame = ttk.LabelFrame(self.file_types_frame, text="Image")
-        image_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
-        
-        # Create "Select All" checkbox for image
-        self.image_all_var = tk.BooleanVar(value=True)
-        image_all_cb = ttk.Checkbutton(
-            image_frame, 
-            text="All Images", 
-            variable=self.image_all_var,
-            command=lambda: self._toggle_all_extensions("image"),
-        )
-        image_all_cb.pack(anchor=tk.W)
-        
-        # Create individual checkboxes for image extensions
-        image_extensions_frame = ttk.Frame(image_frame)
-        image_extensions_frame.pack(fill=tk.X, padx=10)
-        
-        for i, ext in enumerate(SUPPORTED_EXTENSIONS["image"]):
-            ext_name = ext.lstrip(".")
-            var = tk.BooleanVar(value=True)
-            self.extension_vars["image"][ext] = var
-            cb = ttk.Checkbutton(
-                image_extensions_frame, 
-                text=ext_name, 
-                variable=var,
-                command=self._update_extension_selection,
-            )
-            cb.grid(row=i // 2, column=i % 2, sticky=tk.W, padx=5)
-
-        # eBook extensions
-        ebook_frame = ttk.LabelFrame(self.file_types_frame, text="eBook")
-        ebook_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
-
-        # Create "Select All" checkbox for eBook
-        self.ebook_all_var = tk.BooleanVar(value=True)
-        ebook_all_cb = ttk.Checkbutton(
-            ebook_frame,
-            text="All eBooks",
-            variable=self.ebook_all_var,
-            command=lambda: self._toggle_all_extensions("ebook"),
-        )
-        ebook_all_cb.pack(anchor=tk.W)
-
-        # Create individual checkboxes for eBook extensions
-        ebook_extensions_frame = ttk.Frame(ebook_frame)
-        ebook_extensions_frame.pack(fill=tk.X, padx=10)
-
-        for i, ext in enumerate(SUPPORTED_EXTENSIONS["ebook"]):
-            ext_name = ext.lstrip(".")
-            var = tk.BooleanVar(value=True)
-            self.extension_vars["ebook"][ext] = var
-            cb = ttk.Checkbutton(
-                ebook_extensions_frame,
-                text=ext_name,
-                variable=var,
-                command=self._update_extension_selection,
-            )
-            cb.grid(row=i // 2, column=i % 2, sticky=tk.W, padx=5)
+        self.file_types_frame.columnconfigure((0, 1, 2, 3), weight=1, uniform="media_types")
+
+        # The selection variables are needed right away; the checkboxes are only
+        # created the first time the File Type Filters tab is shown
+        for media_type, _, _ in MEDIA_TYPE_LABELS:
+            self._create_extension_vars(media_type)
+        self._extension_checkboxes_built = False
+        self._file_types_tab = file_types_tab
+        content_tabs.bind("<<NotebookTabChanged>>", self._on_content_tab_changed)
         
         # Template configuration (no extra section wrapper)
         template_frame = ttk.Frame(templates_tab, padding=5)
@@ -414,6 +425,8 @@ class ArchimediusGUI:
         # Create template variables and entries for each media type
         self.template_vars = {}
         self.template_entries = {}
+        # Template values last acted on, so leaving an unedited entry does nothing
+        self._committed_templates = {}
         # Variables for exclude unknown options
         self.exclude_unknown_vars = {}
 
@@ -423,14 +436,12 @@ class ArchimediusGUI:
 
         # Audio template
         self.template_vars["audio"] = tk.StringVar(value=self.organizer.templates["audio"])
-        self.template_vars["audio"].trace_add(
-            "write", lambda *_: self._on_template_change("audio")
-        )
         ttk.Label(audio_template_frame, text="Audio Template:").pack(anchor=tk.W)
         self.template_entries["audio"] = ttk.Entry(
             audio_template_frame, textvariable=self.template_vars["audio"]
         )
         self.template_entries["audio"].pack(fill=tk.X, pady=1)
+        self._bind_template_entry("audio")
         ttk.Label(
             audio_template_frame, text="Example: {file_type}/{artist}/{album}/{filename}"
         ).pack(anchor=tk.W)
@@ -446,14 +457,12 @@ class ArchimediusGUI:
 
         # Video template
         self.template_vars["video"] = tk.StringVar(value=self.organizer.templates["video"])
-        self.template_vars["video"].trace_add(
-            "write", lambda *_: self._on_template_change("video")
-        )
         ttk.Label(video_template_frame, text="Video Template:").pack(anchor=tk.W)
         self.template_entries["video"] = ttk.Entry(
             video_template_frame, textvariable=self.template_vars["video"]
         )
         self.template_entries["video"].pack(fill=tk.X, pady=1)
+        self._bind_template_entry("video")
         ttk.Label(video_template_frame, text="Example: {file_type}/{year}/{filename}").pack(
             anchor=tk.W
         )
@@ -469,14 +478,12 @@ class ArchimediusGUI:
 
         # Image template
         self.template_vars["image"] = tk.StringVar(value=self.organizer.templates["image"])
-        self.template_vars["image"].trace_add(
-            "write", lambda *_: self._on_template_change("image")
-        )
         ttk.Label(image_template_frame, text="Image Template:").pack(anchor=tk.W)
         self.template_entries["image"] = ttk.Entry(
             image_template_frame, textvariable=self.template_vars["image"]
         )
         self.template_entries["image"].pack(fill=tk.X, pady=1)
+        self._bind_template_entry("image")
         ttk.Label(
             image_template_frame,
             text="Example: {file_type}/{creation_year}/{creation_month_name}/{filename}",
@@ -493,14 +500,12 @@ class ArchimediusGUI:
 
         # eBook template
         self.template_vars["ebook"] = tk.StringVar(value=self.organizer.templates["ebook"])
-        self.template_vars["ebook"].trace_add(
-            "write", lambda *_: self._on_template_change("ebook")
-        )
         ttk.Label(ebook_template_frame, text="eBook Template:").pack(anchor=tk.W)
         self.template_entries["ebook"] = ttk.Entry(
             ebook_template_frame, textvariable=self.template_vars["ebook"]
         )
         self.template_entries["ebook"].pack(fill=tk.X, pady=1)
+        self._bind_template_entry("ebook")
         ttk.Label(
             ebook_template_frame,
             text="Example: {file_type}/{author}/{title}/{filename}",
@@ -528,7 +533,9 @@ class ArchimediusGUI:
         
         # Add Analyze button
         analyze_button = ttk.Button(
-            self.preview_button_frame, text="Analyze", command=self._generate_preview
+            self.preview_button_frame,
+            text="Analyze",
+            command=lambda: self._generate_preview(rescan=True),
         )
         analyze_button.pack(side=tk.LEFT, padx=5)
         self._create_tooltip(analyze_button, "Refresh the preview based on current settings")
@@ -578,12 +585,11 @@ class ArchimediusGUI:
         self.preview_tree.heading("source", text="Source Path")
         self.preview_tree.heading("destination", text="Destination Path")
         
-        # Configure column widths
-        preview_container.update_idletasks()  # Ensure container has been drawn
-        width = preview_container.winfo_width()
+        # Configure column widths; the path columns start equal and share any extra
+        # width through stretch, so the window doesn't need to be measured first
         self.preview_tree.column("selected", width=60, stretch=False)  # Fixed width for checkbox column
-        self.preview_tree.column("source", width=(width-60)//2, stretch=True)
-        self.preview_tree.column("destination", width=(width-60)//2, stretch=True)
+        self.preview_tree.column("source", width=300, minwidth=100, stretch=True)
+        self.preview_tree.column("destination", width=300, minwidth=100, stretch=True)
 
         # Add click event to toggle selection
         self.preview_tree.bind("<ButtonRelease-1>", self._toggle_selection)
@@ -834,8 +840,7 @@ class ArchimediusGUI:
             # Clear preview when source changes
             self._clear_preview()
             # Auto-save settings if enabled
-            if getattr(self, "auto_save_enabled", True):
-                self._save_settings()
+            self._schedule_save_settings()
             # Auto-generate preview
             self._auto_generate_preview()
     
@@ -848,23 +853,67 @@ class ArchimediusGUI:
             # Clear preview when output changes
             self._clear_preview()
             # Auto-save settings if enabled
-            if getattr(self, "auto_save_enabled", True):
-                self._save_settings()
+            self._schedule_save_settings()
             # Auto-generate preview
             self._auto_generate_preview()
             
     def _clear_preview(self):
         """Clear the preview list and stored preview data."""
-        for item in self.preview_tree.get_children():
-            self.preview_tree.delete(item)
+        self._cancel_preview_insert()
+        self.preview_tree.delete(*self.preview_tree.get_children())
         self._full_preview_data = []
         self._full_preview_count = 0
     
+    def _queue_progress(self, processed, total, current_file):
+        """
+        Record progress from a worker thread and schedule a display update.
+
+        Updates arriving before the scheduled one runs replace each other, so the
+        display changes at most once every PROGRESS_UPDATE_MS.
+
+        Args:
+            processed: Number of files processed
+            total: Number of files to process, or None while the source is still being scanned
+            current_file: Path of the file just processed, or "Complete"
+        """
+        with self._progress_lock:
+            schedule = self._pending_progress is None
+            self._pending_progress = (processed, total, current_file)
+        if schedule:
+            self.root.after(defaults.PROGRESS_UPDATE_MS, self._flush_progress)
+
+    def _flush_progress(self):
+        """Show the most recent progress recorded by _queue_progress."""
+        with self._progress_lock:
+            progress, self._pending_progress = self._pending_progress, None
+        if progress is not None:
+            self._update_progress(*progress)
+
     def _update_progress(self, processed, total, current_file):
-        """Update the progress display."""
+        """
+        Update the progress display.
+
+        Args:
+            processed: Number of files processed
+            total: Number of files to process, or None while the source is still being scanned
+            current_file: Path of the file just processed, or "Complete"
+        """
+        # Until the scan finishes there is no total, so the bar only shows activity
+        indeterminate = str(self.progress_bar.cget("mode")) == "indeterminate"
+        if total is None:
+            if not indeterminate:
+                self.progress_bar.configure(mode="indeterminate")
+                self.progress_bar.start()
+            self.status_var.set(f"Processed: {processed} files (still scanning...)")
+            self._show_current_file(current_file)
+            return
+        if indeterminate:
+            self._reset_progress_bar()
+
         if total > 0:
             progress = (processed / total) * 100
-            self.progress_var.set(progress)
+            # The bar only needs whole percent steps
+            self.progress_var.set(processed * 100 // total)
             
             self.status_var.set(f"Processed: {processed}/{total} files ({progress:.1f}%)")
             
@@ -874,21 +923,39 @@ class ArchimediusGUI:
                 if not hasattr(self, 'processing_selected_files') or not self.processing_selected_files:
                     self._organization_complete()
             else:
-                # Truncate long paths for display
-                if len(current_file) > 70:
-                    display_file = "..." + current_file[-67:]
-                else:
-                    display_file = current_file
-                self.file_var.set(f"Current: {display_file}")
+                self._show_current_file(current_file)
         elif current_file == "Complete":
             self.progress_var.set(0)
             self.status_var.set("No matching files found.")
             self.file_var.set("")
             if not hasattr(self, "processing_selected_files") or not self.processing_selected_files:
                 self._organization_complete()
+
+    def _reset_progress_bar(self):
+        """Return the progress bar to an empty percentage display."""
+        if str(self.progress_bar.cget("mode")) == "indeterminate":
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate")
+        self.progress_var.set(0)
+
+    def _show_current_file(self, current_file):
+        """Show the file being processed, shortening long paths from the left."""
+        if len(current_file) > defaults.PROGRESS_PATH_MAX_LENGTH:
+            display_file = "..." + current_file[3 - defaults.PROGRESS_PATH_MAX_LENGTH :]
+        else:
+            display_file = current_file
+        self.file_var.set(f"Current: {display_file}")
     
-    def _generate_preview(self):
-        """Generate a preview of the organization."""
+    def _generate_preview(self, rescan=False):
+        """
+        Generate a preview of the organization.
+
+        Args:
+            rescan: If True, ignore file lists cached from earlier previews
+        """
+        if rescan:
+            self._preview_scan_cache.clear()
+
         # Validate inputs
         source_dir = self.source_entry.get().strip()
         output_dir = self.output_entry.get().strip()
@@ -928,14 +995,16 @@ class ArchimediusGUI:
     def _generate_preview_thread(self, source_dir, output_dir, templates):
         """Generate preview in a separate thread to keep UI responsive."""
         try:
-            # Configure organizer for preview
-            self.organizer.set_source_dir(source_dir)
+            # The preview gets its own organizer, since it can run while an organize run
+            # is using the shared one
+            organizer = Archimedius()
+            organizer.set_source_dir(source_dir)
             if output_dir:
-                self.organizer.set_output_dir(output_dir)
+                organizer.set_output_dir(output_dir)
 
             # Set templates for each media type
             for media_type, template in templates.items():
-                self.organizer.set_template(template, media_type)
+                organizer.set_template(template, media_type)
             
             # Get selected extensions
             selected_extensions = self._get_selected_extensions()
@@ -944,117 +1013,96 @@ class ArchimediusGUI:
                 self.root.after(0, lambda: self._update_preview_status("No file types selected. Please select at least one file type."))
                 return
                 
-            # Check if destination is inside source to avoid processing files in the destination
             source_path = Path(source_dir)
-            is_dest_in_source = False
-            if output_dir:
-                output_path = Path(output_dir)
-                try:
-                    # Convert to absolute paths for comparison
-                    abs_source = source_path.resolve()
-                    abs_output = output_path.resolve()
-                    # Check if output is a true subdirectory of source (not the same directory)
-                    is_dest_in_source = False
-                    if abs_output != abs_source:
-                        try:
-                            abs_output.relative_to(abs_source)
-                            is_dest_in_source = True
-                        except ValueError:
-                            is_dest_in_source = False
-                    if is_dest_in_source:
-                        logger.info(f"Destination directory is inside source directory. Will skip files in destination for preview.")
-                except Exception as e:
-                    logger.error(f"Error checking directory relationship: {e}")
-
-            # First pass: Count total files for progress tracking
-            self.root.after(0, lambda: self.status_var.set("Counting files..."))
-            total_files = 0
-            for file_path in source_path.rglob("*"):
-                # Skip files in the destination directory if it's inside the source
-                if is_dest_in_source and file_path.is_file():
-                    try:
-                        rel_path = file_path.relative_to(source_path)
-                        dest_path = Path(output_dir) / rel_path
-                        if file_path.is_relative_to(Path(output_dir)) or file_path == dest_path:
-                            continue
-                    except (ValueError, RuntimeError):
-                        pass  # Not relative, so continue processing
-                        
-                if file_path.is_file() and file_path.suffix.lower() in selected_extensions:
-                    total_files += 1
-                    if total_files % 100 == 0:  # Update status periodically
-                        self.root.after(0, lambda count=total_files: self.file_var.set(f"Found {count} files..."))
-
-            # Second pass: Process files for preview
-            self.root.after(0, lambda: self.status_var.set("Finding file details..."))
-            preview_files = []
-            processed = 0
-            
-            for file_path in source_path.rglob("*"):
-                # Skip files in the destination directory if it's inside the source
-                if is_dest_in_source and file_path.is_file():
-                    try:
-                        rel_path = file_path.relative_to(source_path)
-                        dest_path = Path(output_dir) / rel_path
-                        if file_path.is_relative_to(Path(output_dir)) or file_path == dest_path:
-                            continue
-                    except (ValueError, RuntimeError):
-                        pass  # Not relative, so continue processing
-                        
-                if file_path.is_file() and file_path.suffix.lower() in selected_extensions:
+            if output_dir and organizer.is_output_inside_source():
+                logger.info(f"Destination directory is inside source directory. Will skip files in destination for preview.")
+
+            # Reuse the files found by an earlier preview if the source directory is unchanged
+            scan_key = (source_dir, frozenset(selected_extensions), output_dir)
+            source_mtime = os.stat(source_dir).st_mtime_ns
+            cached_scan = self._preview_scan_cache.get(scan_key)
+            if cached_scan is not None and cached_scan[0] == source_mtime:
+                preview_files = cached_scan[1]
+            else:
+                # Walk the source once with scandir, stopping as soon as the preview limit is reached
+                self.root.after(0, lambda: self.status_var.set("Finding files..."))
+                preview_files = []
+                processed = 0
+
+                for file_path in organizer.iter_media_files(selected_extensions):
                     preview_files.append(file_path)
                     processed += 1
-                    # Update progress every 10 files or for the last file
-                    if processed % 10 == 0 or processed == total_files:
-                        progress = (processed / total_files) * 100 if total_files > 0 else 0
+                    # Update progress every 10 files
+                    if processed % 10 == 0:
+                        progress = processed * 100 // defaults.PREVIEW_FILE_LIMIT
                         self.root.after(0, lambda p=progress: self.progress_var.set(p))
-                        self.root.after(0, lambda p=processed, t=total_files: 
-                            self.file_var.set(f"Found {p} of {t} files..."))
-                    
-                    if processed >= 100:  # Limit to 100 files for preview
+                        self.root.after(0, lambda p=processed: self.file_var.set(f"Found {p} files..."))
+
+                    if processed >= defaults.PREVIEW_FILE_LIMIT:
                         break
+
+                if len(self._preview_scan_cache) >= defaults.PREVIEW_SCAN_CACHE_SIZE:
+                    # Drop the oldest entry
+                    self._preview_scan_cache.pop(next(iter(self._preview_scan_cache)))
+                self._preview_scan_cache[scan_key] = (source_mtime, preview_files)
+            processed = len(preview_files)
             
             # Prepare preview data
-            preview_data = []
-            
-            # Generate preview for each file
-            for i, file_path in enumerate(preview_files):
+            extension_map = extensions.get_extension_map(SUPPORTED_EXTENSIONS)
+            fields_by_type = {
+                media_type: get_template_fields(template) for media_type, template in templates.items()
+            }
+            # Source paths are shown relative to the source directory by stripping this prefix
+            source_prefix = os.path.join(str(source_path), "")
+            # Settings that are the same for every file are looked up once
+            exclude_unknown_by_type = {
+                media_type: var.get() for media_type, var in self.exclude_unknown_vars.items()
+            }
+            show_full_paths = self.show_full_paths
+            output_base = organizer.output_dir
+            plan = functools.partial(
+                plan_file,
+                supported_extensions=SUPPORTED_EXTENSIONS,
+                extension_map=extension_map,
+                fields_by_type=fields_by_type,
+                templates=dict(organizer.templates),
+                exclude_unknown_by_type=exclude_unknown_by_type,
+                cache_file=self.metadata_cache_file,
+            )
+            # Metadata read from files the cache didn't have, stored once all rows are done
+            cache_entries = []
+
+            def preview_row(file_path):
+                """Return the preview row for a file, or None if its metadata can't be read."""
                 try:
-                    # Extract metadata
-                    media_file = MediaFile(file_path, SUPPORTED_EXTENSIONS)
-
-                    # Get the appropriate template for this file type
-                    template = self.organizer.get_template(media_file.file_type)
-                    
-                    # Get exclude_unknown setting for this file type
-                    exclude_unknown = self.exclude_unknown_vars.get(media_file.file_type, tk.BooleanVar(value=False)).get()
-                    
-                    # Generate destination path
-                    rel_path = media_file.get_formatted_path(template, exclude_unknown=exclude_unknown)
-                    
-                    # Get source path for display
-                    if getattr(self, "show_full_paths", False):
-                        display_source = str(file_path)
-                        if self.organizer.output_dir:
-                            display_dest = str(self.organizer.output_dir / rel_path)
-                        else:
-                            display_dest = rel_path
-                    else:
-                        try:
-                            display_source = str(file_path.relative_to(source_path))
-                            display_dest = rel_path
-                        except ValueError:
-                            display_source = str(file_path)
-                            if self.organizer.output_dir:
-                                display_dest = str(self.organizer.output_dir / rel_path)
-                            else:
-                                display_dest = rel_path
-                    
-                    # Add to preview data with the full file path
-                    preview_data.append((display_source, display_dest, str(file_path)))
-                    
+                    # Extract metadata and generate the destination path
+                    rel_path, _, cache_entry = plan(file_path)
                 except Exception as e:
                     logger.error(f"Error generating preview for {file_path}: {e}")
+                    return None
+                if cache_entry is not None:
+                    cache_entries.append(cache_entry)
+
+                # Get source path for display
+                file_str = str(file_path)
+                if not show_full_paths and file_str.startswith(source_prefix):
+                    display_source = file_str[len(source_prefix):]
+                    display_dest = rel_path
+                else:
+                    display_source = file_str
+                    if output_base:
+                        display_dest = str(output_base / rel_path)
+                    else:
+                        display_dest = rel_path
+                return display_source, display_dest, file_str
+
+            # Files are read on several threads so their disk reads overlap;
+            # map keeps the rows in scan order
+            with ThreadPoolExecutor(max_workers=defaults.PREVIEW_WORKER_THREADS) as pool:
+                preview_data = [
+                    row for row in pool.map(preview_row, preview_files) if row is not None
+                ]
+            metadata_cache.get_cache(self.metadata_cache_file).put_many(cache_entries)
             
             # Update UI in the main thread
             self.root.after(0, lambda: self._update_preview_results(preview_data, processed))
@@ -1077,38 +1125,28 @@ class ArchimediusGUI:
 
     def _display_preview_data(self, preview_data, count):
         """Populate the preview treeview with the given data and update status."""
-        # Clear existing items
-        for item in self.preview_tree.get_children():
-            self.preview_tree.delete(item)
+        self._cancel_preview_insert()
+
+        # Clear existing items with a single delete command
+        self.preview_tree.delete(*self.preview_tree.get_children())
             
         # Store the full file paths for later processing
         self.preview_files = {}
-        
-        # Insert preview data into treeview
-        for i, (display_source, display_dest, full_path) in enumerate(preview_data):
-            item_id = self.preview_tree.insert("", "end", values=("☐", display_source, display_dest))
-            
-            self.preview_files[item_id] = {
-                "source_path": display_source,
-                "dest_path": display_dest,
-                "selected": False,
-                "full_path": full_path
-            }
+
+        # The first rows are shown right away; the rest are inserted between UI events
+        self._insert_preview_rows(preview_data, 0)
 
         # Update status
         if count == 0:
             self.status_var.set("No media files found in the source directory.")
             self.file_var.set("")
         else:
+            extension_map = extensions.get_extension_map(SUPPORTED_EXTENSIONS)
             media_types = {}
-            for display_source, _, full_path in preview_data:
-                ext = os.path.splitext(full_path)[1].lower()
-                media_type = None
-                for type_name, extensions in SUPPORTED_EXTENSIONS.items():
-                    if ext in extensions:
-                        media_type = type_name
-                        break
-                
+            # Preview paths always come from files with a matched extension, so the
+            # text after the last dot is the extension
+            for _, _, full_path in preview_data:
+                media_type = extension_map.get("." + full_path.rpartition(".")[2].lower())
                 if media_type:
                     media_types[media_type] = media_types.get(media_type, 0) + 1
             
@@ -1116,15 +1154,62 @@ class ArchimediusGUI:
             self.status_var.set(f"Preview generated for {len(preview_data)} files.")
             self.file_var.set(f"Found: {type_counts}")
 
+    def _cancel_preview_insert(self):
+        """Stop adding rows from an earlier preview that is still being inserted."""
+        if self._preview_insert_job is not None:
+            self.root.after_cancel(self._preview_insert_job)
+            self._preview_insert_job = None
+
+    def _insert_preview_rows(self, preview_data, start):
+        """
+        Insert one chunk of preview rows and schedule the next chunk for when the UI is idle.
+
+        Args:
+            preview_data: List of (display source, display destination, full path) tuples
+            start: Index of the first row to insert
+        """
+        end = start + defaults.PREVIEW_INSERT_CHUNK_SIZE
+        # The Tcl insert command is called directly because Treeview.insert
+        # re-processes its options for every row
+        tk_call = self.preview_tree.tk.call
+        tree_name = str(self.preview_tree)
+        for row, (display_source, display_dest, full_path) in enumerate(
+            preview_data[start:end], start
+        ):
+            item_id = tk_call(
+                tree_name,
+                "insert",
+                "",
+                "end",
+                "-values",
+                ("☐", display_source, display_dest),
+                "-tags",
+                "odd" if row % 2 else "even",
+            )
+            
+            self.preview_files[item_id] = {
+                "source_path": display_source,
+                "dest_path": display_dest,
+                "selected": False,
+                "full_path": full_path
+            }
+
+        if end < len(preview_data):
+            self._preview_insert_job = self.root.after_idle(
+                self._insert_preview_rows, preview_data, end
+            )
+        else:
+            self._preview_insert_job = None
+
     def _filter_preview(self):
         """Re-filter stored preview data by currently selected extensions and refresh the tree."""
         if not self._full_preview_data:
             return
         
-        selected_extensions = self._get_selected_extensions()
+        selected_extensions = frozenset(self._get_selected_extensions())
         filtered = [
             (src, dest, path) for src, dest, path in self._full_preview_data
-            if os.path.splitext(path)[1].lower() in selected_extensions
+            if "." + path.rpartition(".")[2].lower() in selected_extensions
         ]
         self._display_preview_data(filtered, len(filtered))
     
@@ -1134,16 +1219,47 @@ class ArchimediusGUI:
         if error:
             messagebox.showerror("Error", message)
     
+    def _schedule_save_settings(self):
+        """
+        Save settings once changes have settled, if auto-save is enabled.
+
+        Toggling "All" or typing a template fires many changes in a row; each call
+        restarts the delay so they end in a single write.
+        """
+        if self.auto_save_enabled:
+            if hasattr(self, "_save_timer"):
+                self.root.after_cancel(self._save_timer)
+            self._save_timer = self.root.after(defaults.AUTO_SAVE_DELAY_MS, self._save_settings)
+
     def _auto_generate_preview(self):
         """Automatically generate preview if enabled and source directory exists."""
-        if self.auto_preview_enabled:
-            source_dir = self.source_entry.get().strip()
-            if source_dir and os.path.exists(source_dir):
-                # Cancel any pending preview generation
-                if hasattr(self, "_preview_timer"):
-                    self.root.after_cancel(self._preview_timer)
-                # Schedule preview generation after a short delay
-                self._preview_timer = self.root.after(500, self._generate_preview)
+        if self.auto_preview_enabled and self.source_entry.get().strip():
+            # Cancel any pending preview generation
+            if hasattr(self, "_preview_timer"):
+                self.root.after_cancel(self._preview_timer)
+            # Schedule preview generation after a short delay
+            self._preview_timer = self.root.after(500, self._check_source_for_preview)
+
+    def _check_source_for_preview(self):
+        """
+        Generate a preview once a worker thread confirms the source directory exists.
+
+        The check runs off the main thread because it can block for seconds on an
+        unreachable network drive. Only the newest check may start a preview.
+        """
+        source_dir = self.source_entry.get().strip()
+        self._preview_source_check += 1
+        check = self._preview_source_check
+
+        def start_preview():
+            if check == self._preview_source_check and self.source_entry.get().strip() == source_dir:
+                self._generate_preview()
+
+        def check_source():
+            if os.path.exists(source_dir):
+                self.root.after(0, start_preview)
+
+        threading.Thread(target=check_source, daemon=True).start()
 
     def _toggle_all_extensions(self, file_type):
         """Toggle all extensions for a file type."""
@@ -1151,8 +1267,7 @@ class ArchimediusGUI:
         for var in self.extension_vars[file_type].values():
             var.set(value)
         # Auto-save settings if enabled
-        if getattr(self, "auto_save_enabled", True):
-            self._save_settings()
+        self._schedule_save_settings()
         # Immediately re-filter existing preview data
         self._filter_preview()
     
@@ -1162,8 +1277,7 @@ class ArchimediusGUI:
             all_selected = all(var.get() for var in self.extension_vars[file_type].values())
             getattr(self, f"{file_type}_all_var").set(all_selected)
         # Auto-save settings if enabled
-        if getattr(self, "auto_save_enabled", True):
-            self._save_settings()
+        self._schedule_save_settings()
         # Immediately re-filter existing preview data
         self._filter_preview()
     
@@ -1176,6 +1290,36 @@ class ArchimediusGUI:
                     selected_extensions.append(ext)
         return selected_extensions
 
+    def _bind_template_entry(self, media_type):
+        """
+        React to a template edit once it is finished rather than on every keystroke.
+
+        Args:
+            media_type: The media type whose template entry to bind
+        """
+        self._committed_templates[media_type] = self.template_vars[media_type].get()
+        entry = self.template_entries[media_type]
+        entry.bind("<FocusOut>", lambda _: self._commit_template(media_type))
+        entry.bind("<Return>", lambda _: self._commit_template(media_type))
+
+    def _set_template(self, media_type, template):
+        """
+        Set a template entry's text from code, so leaving the entry unchanged is not an edit.
+
+        Args:
+            media_type: The media type whose template to set
+            template: The template string
+        """
+        self.template_vars[media_type].set(template)
+        self._committed_templates[media_type] = template
+
+    def _commit_template(self, media_type):
+        """Handle a finished template edit if the template actually changed."""
+        template = self.template_vars[media_type].get()
+        if template != self._committed_templates.get(media_type):
+            self._committed_templates[media_type] = template
+            self._on_template_change(media_type=media_type)
+
     def _on_template_change(self, *_, media_type=None):
         """
         Handle template change event.
@@ -1185,10 +1329,7 @@ class ArchimediusGUI:
             media_type: The media type whose template changed ('audio', 'video', 'image', 'ebook')
         """
         # Auto-save settings after a short delay if enabled
-        if getattr(self, "auto_save_enabled", True):
-            if hasattr(self, "_template_timer"):
-                self.root.after_cancel(self._template_timer)
-            self._template_timer = self.root.after(1000, self._save_settings)
+        self._schedule_save_settings()
         
         # Auto-generate preview after a short delay
         if hasattr(self, "_preview_timer"):
@@ -1197,8 +1338,17 @@ class ArchimediusGUI:
 
     def _show_placeholders_help(self):
         """Show a modal dialog with information about available placeholders."""
+        # The content never changes, so the window is built once and reused
+        if self._help_window is not None and self._help_window.winfo_exists():
+            self._help_window.deiconify()
+            self._help_window.lift()
+            self._help_window.grab_set()
+            self.root.bind_all("<MouseWheel>", self._help_mousewheel)
+            return
+
         # Create a new top-level window
         help_window = tk.Toplevel(self.root)
+        self._help_window = help_window
         help_window.title("Available Placeholders")
         help_window.geometry(defaults.DEFAULT_WINDOW_SIZES["help_window"])
         help_window.minsize(600, 400)
@@ -1240,11 +1390,10 @@ class ArchimediusGUI:
         def _on_mousewheel(event):
             canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
 
+        self._help_mousewheel = _on_mousewheel
         canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        help_window.bind(
-            "<Destroy>",
-            lambda _event: canvas.unbind_all("<MouseWheel>"),
-        )
+        # Closing only hides the window so it can be shown again without rebuilding it
+        help_window.protocol("WM_DELETE_WINDOW", self._hide_placeholders_help)
         
         # Title
         title_label = ttk.Label(
@@ -1260,18 +1409,7 @@ class ArchimediusGUI:
         common_frame = ttk.LabelFrame(categories_frame, text="Common", padding=10)
         common_frame.pack(fill=tk.X, pady=5)
         
-        common_placeholders = [
-            ("{filename}", "Original filename without extension"),
-            ("{extension}", "File extension (e.g., mp3, jpg)"),
-            ("{file_type}", "Type of file (audio, video, image, ebook)"),
-            ("{size}", "File size in bytes"),
-            ("{creation_date}", "File creation date (YYYY-MM-DD)"),
-            ("{creation_year}", "Year of file creation (YYYY)"),
-            ("{creation_month}", "Month of file creation (01-12)"),
-            ("{creation_month_name}", "Month name of file creation (January, February, etc.)"),
-        ]
-        
-        for i, (placeholder, description) in enumerate(common_placeholders):
+        for i, (placeholder, description) in enumerate(COMMON_PLACEHOLDERS):
             ttk.Label(common_frame, text=placeholder, width=15, anchor=tk.W).grid(
                 row=i, column=0, sticky=tk.W, padx=5, pady=2
             )
@@ -1283,18 +1421,7 @@ class ArchimediusGUI:
         audio_frame = ttk.LabelFrame(categories_frame, text="Audio", padding=10)
         audio_frame.pack(fill=tk.X, pady=5)
         
-        audio_placeholders = [
-            ("{title}", "Song title"),
-            ("{artist}", "Artist name"),
-            ("{album}", "Album name"),
-            ("{year}", "Release year"),
-            ("{genre}", "Music genre"),
-            ("{track}", "Track number"),
-            ("{duration}", "Song duration"),
-            ("{bitrate}", "Audio bitrate"),
-        ]
-        
-        for i, (placeholder, description) in enumerate(audio_placeholders):
+        for i, (placeholder, description) in enumerate(AUDIO_PLACEHOLDERS):
             ttk.Label(audio_frame, text=placeholder, width=15, anchor=tk.W).grid(
                 row=i // 2, column=(i % 2) * 2, sticky=tk.W, padx=5, pady=2
             )
@@ -1306,16 +1433,7 @@ class ArchimediusGUI:
         image_frame = ttk.LabelFrame(categories_frame, text="Image", padding=10)
         image_frame.pack(fill=tk.X, pady=5)
         
-        image_placeholders = [
-            ("{width}", "Image width in pixels"),
-            ("{height}", "Image height in pixels"),
-            ("{format}", "Image format (e.g., JPEG, PNG)"),
-            ("{camera_make}", "Camera manufacturer"),
-            ("{camera_model}", "Camera model"),
-            ("{date_taken}", "Date when the photo was taken"),
-        ]
-        
-        for i, (placeholder, description) in enumerate(image_placeholders):
+        for i, (placeholder, description) in enumerate(IMAGE_PLACEHOLDERS):
             ttk.Label(image_frame, text=placeholder, width=15, anchor=tk.W).grid(
                 row=i // 2, column=(i % 2) * 2, sticky=tk.W, padx=5, pady=2
             )
@@ -1327,14 +1445,7 @@ class ArchimediusGUI:
         ebook_frame = ttk.LabelFrame(categories_frame, text="eBook", padding=10)
         ebook_frame.pack(fill=tk.X, pady=5)
 
-        ebook_placeholders = [
-            ("{title}", "Book title"),
-            ("{author}", "Author name"),
-            ("{year}", "Publication year"),
-            ("{genre}", "Book genre"),
-        ]
-
-        for i, (placeholder, description) in enumerate(ebook_placeholders):
+        for i, (placeholder, description) in enumerate(EBOOK_PLACEHOLDERS):
             ttk.Label(ebook_frame, text=placeholder, width=15, anchor=tk.W).grid(
                 row=i // 2, column=(i % 2) * 2, sticky=tk.W, padx=5, pady=2
             )
@@ -1346,26 +1457,7 @@ class ArchimediusGUI:
         example_frame = ttk.LabelFrame(content_frame, text="Example Templates", padding=10)
         example_frame.pack(fill=tk.X, pady=5)
         
-        examples = [
-            (
-                "{file_type}/{artist}/{album}/{filename}",
-                "Organizes by file type, then artist, then album",
-            ),
-            (
-                "Music/{year}/{artist} - {title}.{extension}",
-                "Organizes music by year, then artist-title",
-            ),
-            (
-                "{file_type}/{creation_year}/{creation_month_name}/{filename}",
-                "Organizes by file type, year, and month",
-            ),
-            (
-                "Photos/{creation_year}/{creation_month}/{filename}",
-                "Organizes photos by year and month number",
-            ),
-        ]
-        
-        for i, (template, description) in enumerate(examples):
+        for i, (template, description) in enumerate(EXAMPLE_TEMPLATES):
             ttk.Label(example_frame, text=template, wraplength=250, anchor=tk.W).grid(
                 row=i, column=0, sticky=tk.W, padx=5, pady=2
             )
@@ -1374,9 +1466,17 @@ class ArchimediusGUI:
             )
         
         # Close button
-        close_button = ttk.Button(content_frame, text="Close", command=help_window.destroy)
+        close_button = ttk.Button(
+            content_frame, text="Close", command=self._hide_placeholders_help
+        )
         close_button.pack(pady=20)
 
+    def _hide_placeholders_help(self):
+        """Hide the placeholders help dialog, keeping it for the next time it is shown."""
+        self.root.unbind_all("<MouseWheel>")
+        self._help_window.grab_release()
+        self._help_window.withdraw()
+
     def _create_tooltip(self, widget, text):
         """Create a tooltip for a widget."""
         def enter(_):
@@ -1521,114 +1621,110 @@ class ArchimediusGUI:
     def _run_organization_process(self, selected_extensions):
         """Run the actual organization process in a separate thread."""
         try:
-            # Find all media files
-            source_path = Path(self.organizer.source_dir)
-            output_path = Path(self.organizer.output_dir)
+            # Destinations are joined as strings; the walk also yields plain strings
+            output_path = str(self.organizer.output_dir)
 
             # Check if destination is inside source to avoid processing files in the destination
-            is_dest_in_source = False
-            try:
-                # Convert to absolute paths for comparison
-                abs_source = source_path.resolve()
-                abs_output = output_path.resolve()
-                # Check if output is a true subdirectory of source (not the same directory)
-                is_dest_in_source = False
-                if abs_output != abs_source:
-                    try:
-                        abs_output.relative_to(abs_source)
-                        is_dest_in_source = True
-                    except ValueError:
-                        is_dest_in_source = False
-                if is_dest_in_source:
-                    logger.info(f"Destination directory is inside source directory. Will skip files in destination.")
-            except Exception as e:
-                logger.error(f"Error checking directory relationship: {e}")
+            if self.organizer.is_output_inside_source():
+                logger.info(f"Destination directory is inside source directory. Will skip files in destination.")
+
+            # Create a custom supported_extensions dictionary with only selected extensions
+            custom_extensions = {}
+            for media_type, extensions_list in SUPPORTED_EXTENSIONS.items():
+                custom_extensions[media_type] = [ext for ext in extensions_list if ext in selected_extensions]
+            extension_map = extensions.get_extension_map(custom_extensions)
+            templates = dict(self.organizer.templates)
+            # Fields each template uses, so files whose template needs no tags are not parsed
+            fields_by_type = {
+                media_type: get_template_fields(template) for media_type, template in templates.items()
+            }
 
-            # Count total files first (excluding files in destination if it's inside source)
-            total_files = 0
-            for file_path in source_path.rglob("*"):
-                if self.organizer.stop_requested:
-                    break
-                    
-                # Skip files in the destination directory if it's inside the source
-                if is_dest_in_source and file_path.is_file():
-                    try:
-                        rel_path = file_path.relative_to(source_path)
-                        dest_path = output_path / rel_path
-                        if file_path.is_relative_to(output_path) or file_path == dest_path:
-                            continue
-                    except (ValueError, RuntimeError):
-                        pass  # Not relative, so continue processing
-                        
-                if file_path.is_file() and file_path.suffix.lower() in selected_extensions:
-                    total_files += 1
-            
-            # Process files
+            # Read the exclude_unknown settings once; Tk variables are not safe to share with workers
+            exclude_unknown_by_type = {
+                media_type: var.get() for media_type, var in self.exclude_unknown_vars.items()
+            }
+
+            # Metadata is read in worker processes, since tag parsing holds the GIL
+            plan = functools.partial(
+                plan_file,
+                supported_extensions=custom_extensions,
+                extension_map=extension_map,
+                fields_by_type=fields_by_type,
+                templates=templates,
+                exclude_unknown_by_type=exclude_unknown_by_type,
+                cache_file=self.metadata_cache_file,
+            )
+
+            # Read once so every file in the run uses the same operation
+            mode = self.organizer.operation_mode
+
+            # Files are handed to the workers as the scan finds them, so copying starts
+            # right away; the backlog of waiting files is capped at DEFAULT_PIPELINE_DEPTH
             processed = 0
-            
-            for file_path in source_path.rglob("*"):
+            pending = {}
+            # Metadata read from files the cache didn't have, stored in one batch at the end
+            cache_entries = []
+            # Counts for this run's walk of the source; a preview walks it separately
+            scan = ScanProgress()
+
+            # Errors logged while reading metadata in the workers are forwarded to this
+            # process's loggers, so they reach the log window and log file
+            mp_context = multiprocessing.get_context(defaults.METADATA_PROCESS_START_METHOD)
+            with worker_log_forwarding(mp_context) as log_forwarding, ProcessPoolExecutor(
+                max_workers=defaults.DEFAULT_METADATA_PROCESSES,
+                mp_context=mp_context,
+                **log_forwarding,
+            ) as planner, ThreadPoolExecutor(max_workers=defaults.DEFAULT_WORKER_THREADS) as executor:
+                for file_path in self.organizer.iter_media_files(selected_extensions, scan):
+                    if self.organizer.stop_requested:
+                        break
+                    if len(pending) >= defaults.DEFAULT_PIPELINE_DEPTH:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        # The total is unknown until the scan finishes
+                        processed = self._collect_organized(
+                            done, pending, processed, None, cache_entries
+                        )
+                    pending[
+                        executor.submit(
+                            self._organize_file, planner, plan, file_path, output_path, mode
+                        )
+                    ] = file_path
+
+                total_files = scan.files_discovered
+                while pending and not self.organizer.stop_requested:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    processed = self._collect_organized(
+                        done, pending, processed, total_files, cache_entries
+                    )
+
                 if self.organizer.stop_requested:
                     logger.info("Organization stopped by user")
-                    break
-                    
-                # Skip files in the destination directory if it's inside the source
-                if is_dest_in_source and file_path.is_file():
-                    try:
-                        rel_path = file_path.relative_to(source_path)
-                        dest_path = output_path / rel_path
-                        if file_path.is_relative_to(output_path) or file_path == dest_path:
-                            continue
-                    except (ValueError, RuntimeError):
-                        pass  # Not relative, so continue processing
-                    
-                if file_path.is_file() and file_path.suffix.lower() in selected_extensions:
-                    try:
-                        # Create a custom supported_extensions dictionary with only selected extensions
-                        custom_extensions = {}
-                        for media_type, extensions_list in SUPPORTED_EXTENSIONS.items():
-                            custom_extensions[media_type] = [ext for ext in extensions_list if ext in selected_extensions]
-                        
-                        # Extract metadata
-                        media_file = MediaFile(file_path, custom_extensions)
-
-                        # Get the appropriate template for this file type
-                        template = self.organizer.get_template(media_file.file_type)
-                        
-                        # Get exclude_unknown setting for this file type
-                        exclude_unknown = self.exclude_unknown_vars.get(media_file.file_type, tk.BooleanVar(value=False)).get()
-                        
-                        # Generate destination path
-                        rel_path = media_file.get_formatted_path(template, exclude_unknown=exclude_unknown)
-                        dest_path = output_path / rel_path
-                        
-                        # Create destination directory if it doesn't exist
-                        os.makedirs(dest_path.parent, exist_ok=True)
-                        
-                        # Copy or move the file based on operation mode
-                        if self.organizer.operation_mode == "copy":
-                            shutil.copy2(file_path, dest_path)
-                            logger.info(f"Copied {file_path} to {dest_path}")
-                        else:  # move mode
-                            shutil.move(file_path, dest_path)
-                            logger.info(f"Moved {file_path} to {dest_path}")
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing file {file_path}: {e}")
-                    
-                    # Update progress
-                    processed += 1
-                    self.root.after(
-                        0, lambda p=processed, t=total_files, f=str(file_path): self._update_progress(p, t, f)
+                    # Files already being processed finish; queued ones are dropped
+                    for future in pending:
+                        future.cancel()
+                    # Count the files that were copied or moved before the stop took effect
+                    done, _ = wait(pending)
+                    finished = [future for future in done if not future.cancelled()]
+                    processed = self._collect_organized(
+                        finished, pending, processed, total_files, cache_entries
                     )
-            
+
+            cache = metadata_cache.get_cache(self.metadata_cache_file)
+            cache.put_many(cache_entries)
+            if not self.organizer.stop_requested:
+                # Entries for files that were moved or deleted since they were read
+                cache.prune(self.organizer.source_dir)
+
             # Complete
             self.organizer.files_processed = processed
-            self.root.after(0, lambda p=processed, t=total_files: self._update_progress(p, t, "Complete"))
-            operation_name = "copy" if self.organizer.operation_mode == "copy" else "move"
+            self._queue_progress(processed, total_files, "Complete")
+            operation_name = "copy" if mode == "copy" else "move"
             logger.info(f"{operation_name.capitalize()} operation complete. Processed {processed} files.")
             
         except Exception as e:
             logger.error(f"Error during organization: {e}")
+            # No Complete update follows, so stop the scanning animation here
+            self.root.after(0, self._reset_progress_bar)
             self.root.after(
                 0,
                 lambda msg=str(e): messagebox.showerror(
@@ -1638,6 +1734,79 @@ class ArchimediusGUI:
         finally:
             self.organizer.is_running = False
     
+    def _collect_organized(self, done, pending, processed, total, cache_entries):
+        """
+        Record finished organize jobs and report progress.
+
+        Args:
+            done: Futures that have finished
+            pending: Dictionary of outstanding futures to their file paths; finished ones are removed
+            processed: Number of files processed before this call
+            total: Number of files found, or None while the source is still being scanned
+            cache_entries: List that metadata cache entries of finished files are added to
+
+        Returns:
+            Updated number of processed files
+        """
+        for future in done:
+            file_path = pending.pop(future)
+            try:
+                cache_entry = future.result()
+            except Exception as e:
+                logger.error(f"Error processing file {file_path}: {e}")
+            else:
+                if cache_entry is not None:
+                    cache_entries.append(cache_entry)
+
+            processed += 1
+            if processed % defaults.PROGRESS_LOG_INTERVAL == 0:
+                logger.info(f"Processed {processed} files...")
+            self._queue_progress(processed, total, str(file_path))
+        return processed
+
+    def _organize_file(self, planner, plan, file_path, output_path, mode):
+        """
+        Copy or move a single file to its templated destination.
+
+        Args:
+            planner: Process pool that runs plan
+            plan: plan_file with everything but the file path filled in
+            file_path: Path of the source file
+            output_path: Root of the output directory
+            mode: "copy" or "move"
+
+        Returns:
+            Metadata cache entry for the file if it was copied and its contents were
+            read, otherwise None
+        """
+        # Extract metadata and generate the destination path in a worker process;
+        # this thread only waits for the result, then does the I/O
+        rel_path, file_stat, cache_entry = planner.submit(plan, file_path).result()
+        dest_path = os.path.join(output_path, rel_path)
+
+        # Create destination directory if it doesn't exist
+        self.organizer.ensure_dir(os.path.dirname(dest_path))
+
+        # Copy or move the file based on operation mode; the per-file messages use lazy
+        # formatting because debug logging is usually off and this runs for every file.
+        # Files that map to the same destination are written one at a time.
+        with self.organizer.destination_lock(dest_path):
+            if mode == "copy":
+                # Re-running a copy leaves files copied by an earlier run alone
+                if is_copy_current(dest_path, file_stat):
+                    logger.debug("Skipped %s, %s is already up to date", file_path, dest_path)
+                    return cache_entry
+                with self.organizer.device_slot(file_stat):
+                    copy_file(file_path, dest_path, file_stat)
+                logger.debug("Copied %s to %s", file_path, dest_path)
+            else:  # move mode
+                with self.organizer.device_slot(file_stat):
+                    move_file(file_path, dest_path)
+                logger.debug("Moved %s to %s", file_path, dest_path)
+                # Entries are keyed by the source path, which no longer exists
+                return None
+        return cache_entry
+
     def _stop_organization(self):
         """Stop the organization process."""
         if self.organizer.is_running:
@@ -1661,6 +1830,9 @@ class ArchimediusGUI:
 
     def _save_settings(self):
         """Save user settings to a configuration file."""
+        # Saving now makes a pending auto-save redundant
+        if hasattr(self, "_save_timer"):
+            self.root.after_cancel(self._save_timer)
         try:
             # Collect settings
             settings = {
@@ -1674,12 +1846,7 @@ class ArchimediusGUI:
                 },
                 # For backward compatibility
                 "template": self.template_vars["audio"].get().strip(),
-                "extensions": {
-                    "audio": {ext: var.get() for ext, var in self.extension_vars["audio"].items()},
-                    "video": {ext: var.get() for ext, var in self.extension_vars["video"].items()},
-                    "image": {ext: var.get() for ext, var in self.extension_vars["image"].items()},
-                    "ebook": {ext: var.get() for ext, var in self.extension_vars["ebook"].items()},
-                },
+                "extensions": self._get_extension_selections(),
                 # Save exclude unknown settings
                 "exclude_unknown": {
                     "audio": self.exclude_unknown_vars["audio"].get(),
@@ -1689,23 +1856,50 @@ class ArchimediusGUI:
                 },
                 # Save custom extensions
                 "custom_extensions": SUPPORTED_EXTENSIONS,
-                "show_full_paths": getattr(self, "show_full_paths", False),
-                "auto_save_enabled": getattr(self, "auto_save_enabled", True),
-                "auto_preview_enabled": getattr(self, "auto_preview_enabled", True),
-                "logging_level": getattr(self, "logging_level", defaults.DEFAULT_SETTINGS["logging_level"]),
-                "dark_mode": getattr(self, "dark_mode", defaults.DEFAULT_SETTINGS["dark_mode"]),
+                "show_full_paths": self.show_full_paths,
+                "auto_save_enabled": self.auto_save_enabled,
+                "auto_preview_enabled": self.auto_preview_enabled,
+                "logging_level": self.logging_level,
+                "dark_mode": self.dark_mode,
                 "window_geometry": self.root.geometry(),
                 "operation_mode": getattr(self, "operation_mode", "copy"),
             }
             
-            # Save to file
-            with open(self.config_file, "w") as f:
-                json.dump(settings, f)
+            # Auto-save fires on many UI events that leave the settings unchanged
+            data = json.dumps(settings)
+            if data == self._last_saved_settings:
+                logger.debug("Settings unchanged, skipping save")
+                return
+
+            # Write to a temporary file and swap it in so a crash never leaves a partial file
+            temp_file = self.config_file.with_name(self.config_file.name + ".tmp")
+            with open(temp_file, "w") as f:
+                f.write(data)
+                # Flush to disk first, or a crash right after the swap can leave an empty file
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.config_file)
+            self._last_saved_settings = data
                 
             logger.info(f"Settings saved to {self.config_file}")
         except Exception as e:
             logger.error(f"Error saving settings: {e}")
     
+    def _get_extension_selections(self):
+        """
+        Get the selected state of every extension by media type, for saving.
+
+        Returns:
+            Dictionary mapping each media type to a dictionary of extension to selected state
+        """
+        for media_type, ext_vars in self.extension_vars.items():
+            if media_type in self._changed_extension_types:
+                self._saved_extension_selections[media_type] = {
+                    ext: var.get() for ext, var in ext_vars.items()
+                }
+        self._changed_extension_types.clear()
+        return self._saved_extension_selections
+
     def _load_settings(self):
         """Load user settings from the configuration file."""
         try:
@@ -1735,12 +1929,11 @@ class ArchimediusGUI:
                             media_type in settings["templates"]
                             and settings["templates"][media_type]
                         ):
-                            self.template_vars[media_type].set(settings["templates"][media_type])
+                            self._set_template(media_type, settings["templates"][media_type])
                 # For backward compatibility
                 elif "template" in settings and settings["template"]:
-                    self.template_vars["audio"].set(settings["template"])
-                    # Also update the default template variable for backward compatibility
-                    self.template_var.set(settings["template"])
+                    # template_var is the audio variable, kept for backward compatibility
+                    self._set_template("audio", settings["template"])
 
                 # Load custom extensions if available
                 if "custom_extensions" in settings:
@@ -1819,10 +2012,7 @@ class ArchimediusGUI:
 
                 # Reset templates to defaults
                 for media_type in ["audio", "video", "image", "ebook"]:
-                    self.template_vars[media_type].set(defaults.DEFAULT_TEMPLATES[media_type])
-
-                # For backward compatibility
-                self.template_var.set(defaults.DEFAULT_TEMPLATES["audio"])
+                    self._set_template(media_type, defaults.DEFAULT_TEMPLATES[media_type])
                 
                 # Reset extension checkboxes to checked
                 for file_type in ["audio", "video", "image", "ebook"]:
@@ -1845,6 +2035,10 @@ class ArchimediusGUI:
                 if self.config_file.exists():
                     self.config_file.unlink()
                     logger.info(f"Settings file deleted: {self.config_file}")
+                self._last_saved_settings = None
+
+                # Metadata read by earlier runs is forgotten too
+                metadata_cache.get_cache(self.metadata_cache_file).clear()
                 
                 self.status_var.set("Settings reset to defaults")
                 
@@ -1852,6 +2046,16 @@ class ArchimediusGUI:
                 logger.error(f"Error resetting settings: {e}")
                 messagebox.showerror("Error", f"Failed to reset settings: {str(e)}")
 
+    def _clear_metadata_cache(self):
+        """Forget the metadata stored by earlier runs, so every file is read again."""
+        if messagebox.askyesno(
+            "Clear Metadata Cache",
+            "Forget the metadata read by earlier runs? Every file will be read again.",
+        ):
+            metadata_cache.get_cache(self.metadata_cache_file).clear()
+            logger.info(f"Metadata cache cleared: {self.metadata_cache_file}")
+            self.status_var.set("Metadata cache cleared")
+
     def _save_settings_manual(self):
         """Manually save settings and show confirmation."""
         self._save_settings()
@@ -1983,62 +2187,79 @@ class ArchimediusGUI:
             # Update UI
             self.root.after(0, lambda: self._update_ui_for_processing(True))
             
-            # Get the output path
-            output_path = Path(self.organizer.output_dir)
+            # Get the output path; destinations are joined as strings
+            output_path = str(self.organizer.output_dir)
             
+            # Resolve every destination up front so each directory is created only once
+            resolved_files = []
+            for source_path, dest_rel in selected_files:
+                # Skip if the source file doesn't exist; the stat result is kept so
+                # copying can apply its times and mode without another stat call
+                try:
+                    source_stat = os.stat(source_path)
+                except FileNotFoundError:
+                    resolved_files.append((source_path, None, None))
+                    continue
+                # For destination, check if it's a relative or absolute path
+                if os.path.isabs(dest_rel):
+                    dest_file = dest_rel
+                else:
+                    dest_file = os.path.join(output_path, dest_rel)
+                resolved_files.append((source_path, dest_file, source_stat))
+
+            # Create destination directories before copying
+            self.organizer.create_parent_dirs(
+                dest_file for _, dest_file, _ in resolved_files if dest_file is not None
+            )
+
             # Process each selected file
-            total_files = len(selected_files)
+            total_files = len(resolved_files)
             processed = 0
             successful = 0  # Track successfully processed files
             
-            for source_path, dest_rel in selected_files:
-                if self.organizer.stop_requested:
-                    logger.info("Processing stopped by user")
-                    break
-                    
-                try:
-                    # Convert paths
-                    source_file = Path(source_path)
-                    
-                    # Skip if the source file doesn't exist
-                    if not source_file.exists():
-                        logger.warning(f"Skipping file {source_file} as it no longer exists")
+            # Files are copied or moved on worker threads; file I/O releases the GIL
+            with ThreadPoolExecutor(max_workers=defaults.DEFAULT_WORKER_THREADS) as executor:
+                futures = {
+                    executor.submit(
+                        self._transfer_selected_file, source_path, dest_file, source_stat, mode
+                    ): source_path
+                    for source_path, dest_file, source_stat in resolved_files
+                }
+                remaining = set(futures)
+                for future in as_completed(futures):
+                    remaining.discard(future)
+                    finished = [future]
+                    stopping = self.organizer.stop_requested
+                    if stopping:
+                        logger.info("Processing stopped by user")
+                        # Files already being processed finish; queued ones are dropped
+                        for pending in remaining:
+                            pending.cancel()
+                        # Count the files that were copied or moved before the stop took effect
+                        done, _ = wait(remaining)
+                        finished.extend(job for job in done if not job.cancelled())
+
+                    for done_future in finished:
+                        source_path = futures[done_future]
+                        try:
+                            if done_future.result():
+                                # Increment successful count
+                                successful += 1
+                        except Exception as e:
+                            logger.error(f"Error processing file {source_path}: {e}")
+
+                        # Update progress
                         processed += 1
-                        continue
-                    
-                    # For destination, check if it's a relative or absolute path
-                    if os.path.isabs(dest_rel):
-                        dest_file = Path(dest_rel)
-                    else:
-                        dest_file = output_path / dest_rel
-                    
-                    # Create destination directory if it doesn't exist
-                    os.makedirs(dest_file.parent, exist_ok=True)
-                    
-                    # Copy or move the file
-                    if mode == "copy":
-                        shutil.copy2(source_file, dest_file)
-                        logger.info(f"Copied {source_file} to {dest_file}")
-                    else:  # move mode
-                        shutil.move(source_file, dest_file)
-                        logger.info(f"Moved {source_file} to {dest_file}")
-                    
-                    # Increment successful count
-                    successful += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing file {source_path}: {e}")
-                    
-                # Update progress
-                processed += 1
-                self.root.after(0, lambda p=processed, t=total_files, f=source_path: 
-                               self._update_progress(p, t, f))
+                        self._queue_progress(processed, total_files, source_path)
+
+                    if stopping:
+                        break
                 
             # Update the organizer's files_processed attribute
             self.organizer.files_processed = successful
             
             # Complete
-            self.root.after(0, lambda: self._update_progress(processed, total_files, "Complete"))
+            self._queue_progress(processed, total_files, "Complete")
             operation_name = "copy" if mode == "copy" else "move"
             logger.info(f"{operation_name.capitalize()} operation complete. Processed {successful} files successfully out of {processed} attempted.")
             
@@ -2051,7 +2272,7 @@ class ArchimediusGUI:
             
             # Refresh the preview if files were moved to show current state
             if mode == "move" and successful > 0:
-                self.root.after(500, self._generate_preview)
+                self.root.after(500, lambda: self._generate_preview(rescan=True))
             
         except Exception as e:
             logger.error(f"Error during processing: {e}")
@@ -2062,6 +2283,39 @@ class ArchimediusGUI:
             # Update UI
             self.root.after(0, lambda: self._update_ui_for_processing(False))
             
+    def _transfer_selected_file(self, source_file, dest_file, source_stat, mode):
+        """
+        Copy or move one selected file to its previewed destination.
+
+        Args:
+            source_file: Path of the source file
+            dest_file: Destination path, or None if the source no longer exists
+            source_stat: Stat result of the source file, or None if it no longer exists
+            mode: "copy" or "move"
+
+        Returns:
+            True if the file was copied or moved, False if it was skipped
+        """
+        if dest_file is None:
+            logger.warning(f"Skipping file {source_file} as it no longer exists")
+            return False
+
+        # Copy or move the file; several rows can share a destination, and those are
+        # written one at a time
+        with self.organizer.destination_lock(dest_file):
+            if mode == "copy":
+                if is_copy_current(dest_file, source_stat):
+                    logger.info(f"Skipped {source_file}, {dest_file} is already up to date")
+                    return True
+                with self.organizer.device_slot(source_stat):
+                    copy_file(source_file, dest_file, source_stat)
+                logger.info(f"Copied {source_file} to {dest_file}")
+            else:  # move mode
+                with self.organizer.device_slot(source_stat):
+                    move_file(source_file, dest_file)
+                logger.info(f"Moved {source_file} to {dest_file}")
+        return True
+
     def _update_ui_for_processing(self, is_processing):
         """Update the UI elements for processing state."""
         if is_processing:
@@ -2153,60 +2407,83 @@ class ArchimediusGUI:
             # Reset the processing_selected_files flag
             self.processing_selected_files = False
 
+            # Files may have been moved, so the next preview scans the source again
+            self._preview_scan_cache.clear()
+
     def _refresh_extension_filters(self):
         """Refresh the extension filter checkboxes based on current SUPPORTED_EXTENSIONS."""
-        # Store current selections before clearing frames
-        current_selections = {}
-        current_all_selections = {}
-        for file_type in ["audio", "video", "image", "ebook"]:
-            current_selections[file_type] = {ext: var.get() for ext, var in self.extension_vars[file_type].items()}
-            current_all_selections[file_type] = getattr(self, f"{file_type}_all_var").get()
-
-        # Clear existing extension frames
-        for frame in self.file_types_frame.winfo_children():
-            frame.destroy()
-        
-        # Recreate extension frames for each file type
-        for file_type, frame_title in [
-            ("audio", "Audio"), ("video", "Video"), 
-            ("image", "Image"), ("ebook", "eBook")
-        ]:
-            # Create frame
-            type_frame = ttk.LabelFrame(self.file_types_frame, text=frame_title)
-            type_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
-            
-            # Create "Select All" checkbox
+        for media_type, _, _ in MEDIA_TYPE_LABELS:
             # If parent was selected, keep new extensions selected
-            all_selected = current_all_selections.get(file_type, True)
-            all_var = tk.BooleanVar(value=all_selected)
-            setattr(self, f"{file_type}_all_var", all_var)
+            all_selected = getattr(self, f"{media_type}_all_var").get()
+            selections = {ext: var.get() for ext, var in self.extension_vars[media_type].items()}
+            self._create_extension_vars(media_type, all_selected, selections)
+
+        if self._extension_checkboxes_built:
+            # Clear existing extension frames and recreate them with the new variables
+            for frame in self.file_types_frame.winfo_children():
+                frame.destroy()
+            self._build_extension_checkboxes()
+
+    def _create_extension_vars(self, media_type, all_selected=True, selections=None):
+        """
+        Create the "All" variable and one variable per extension for a media type.
+
+        Args:
+            media_type: The media type (audio, video, image, ebook)
+            all_selected: Whether the "All" checkbox starts selected
+            selections: Previous selection state by extension, if any
+        """
+        selections = selections or {}
+        setattr(self, f"{media_type}_all_var", tk.BooleanVar(self.root, value=all_selected))
+        # If parent was selected or extension existed and was selected, keep it selected
+        self.extension_vars[media_type] = {
+            ext: tk.BooleanVar(self.root, value=all_selected or selections.get(ext, True))
+            for ext in SUPPORTED_EXTENSIONS[media_type]
+        }
+        # Saving re-reads a media type's variables only after one of them changed
+        self._changed_extension_types.add(media_type)
+        for var in self.extension_vars[media_type].values():
+            var.trace_add("write", lambda *_, mt=media_type: self._changed_extension_types.add(mt))
+
+    def _on_content_tab_changed(self, event):
+        """Create the extension checkboxes the first time the File Type Filters tab is shown."""
+        if not self._extension_checkboxes_built and event.widget.select() == str(
+            self._file_types_tab
+        ):
+            self._build_extension_checkboxes()
+
+    def _build_extension_checkboxes(self):
+        """Create a column of extension checkboxes for each media type."""
+        self._extension_checkboxes_built = True
+        # Filters stay disabled if the tab is first opened while files are being organized
+        state = tk.DISABLED if self.organizer.is_running else tk.NORMAL
+
+        for column, (media_type, title, all_text) in enumerate(MEDIA_TYPE_LABELS):
+            type_frame = ttk.LabelFrame(self.file_types_frame, text=title)
+            type_frame.grid(row=0, column=column, sticky=tk.NSEW, padx=5)
+
+            # Create "Select All" checkbox
             all_cb = ttk.Checkbutton(
                 type_frame,
-                text=f"All {frame_title}",
-                variable=all_var,
-                command=lambda ft=file_type: self._toggle_all_extensions(ft)
+                text=all_text,
+                variable=getattr(self, f"{media_type}_all_var"),
+                command=lambda mt=media_type: self._toggle_all_extensions(mt),
+                state=state,
             )
             all_cb.pack(anchor=tk.W)
-            
-            # Create frame for extension checkboxes
+
+            # Create individual checkboxes for each extension
             extensions_frame = ttk.Frame(type_frame)
             extensions_frame.pack(fill=tk.X, padx=10)
-            
-            # Clear existing extension vars for this type
-            self.extension_vars[file_type] = {}
-            
-            # Create checkboxes for each extension
-            for i, ext in enumerate(SUPPORTED_EXTENSIONS[file_type]):
-                ext_name = ext.lstrip(".")
-                # If parent was selected or extension existed and was selected, keep it selected
-                selected = all_selected or current_selections.get(file_type, {}).get(ext, True)
-                var = tk.BooleanVar(value=selected)
-                self.extension_vars[file_type][ext] = var
+
+            for i, (ext, var) in enumerate(self.extension_vars[media_type].items()):
                 cb = ttk.Checkbutton(
                     extensions_frame,
-                    text=ext_name,
+                    text=ext.lstrip("."),
                     variable=var,
-                    command=self._update_extension_selection
+                    command=self._update_extension_selection,
+                    state=state,
+                    style="Ext.TCheckbutton",
                 )
                 cb.grid(row=i // 2, column=i % 2, sticky=tk.W, padx=5)
 
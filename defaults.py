@@ -8,6 +8,7 @@ Centralizing these values makes the application more maintainable and configurab
 # Import the extensions module to access DEFAULT_EXTENSIONS
 import extensions
 import logging
+import os
 
 # Application information
 APP_NAME = "Archimedius"
@@ -63,10 +64,51 @@ DEFAULT_WINDOW_SIZES = {
     "about_dialog": "500x450",
 }
 
+# Delay in milliseconds before auto-saving settings after a change
+AUTO_SAVE_DELAY_MS = 1000
+
+# Maximum number of files shown in the preview
+PREVIEW_FILE_LIMIT = 100
+
+# Number of preview file lists kept for reuse while the source directory is unchanged
+PREVIEW_SCAN_CACHE_SIZE = 8
+
+# Preview rows inserted per event loop pass; the rest are added when the UI is idle
+PREVIEW_INSERT_CHUNK_SIZE = 25
+
+# Number of threads reading metadata for the preview; they overlap waiting on file reads
+PREVIEW_WORKER_THREADS = 8
+
+# Number of worker threads used to organize files in parallel
+DEFAULT_WORKER_THREADS = min(32, (os.cpu_count() or 4) * 4)
+
+# Number of files copied or moved at once from a single spinning disk, to limit seeking
+ROTATIONAL_DEVICE_THREADS = 1
+
+# Number of worker processes used to read metadata while organizing (Windows allows at most 61)
+DEFAULT_METADATA_PROCESSES = min(61, os.cpu_count() or 1)
+
+# Start method for the metadata worker processes; forking a process that is already
+# running the GUI, logging and copy threads can deadlock on locks held at the time
+METADATA_PROCESS_START_METHOD = "spawn"
+
+# Number of organized files between progress summaries in the log
+PROGRESS_LOG_INTERVAL = 500
+
+# Minimum milliseconds between progress display updates while organizing
+PROGRESS_UPDATE_MS = 50
+
+# Longest current-file path shown in the progress display before it is shortened
+PROGRESS_PATH_MAX_LENGTH = 70
+
+# Maximum number of discovered files waiting for a worker while the source is still being scanned
+DEFAULT_PIPELINE_DEPTH = 1024
+
 # Default file paths
 DEFAULT_PATHS = {
     "settings_file": "archimedius_settings.json",
     "log_file": "archimedius.log",
+    "metadata_cache_file": "archimedius_metadata.cache",
 }
 
 # Function to get all default extensions
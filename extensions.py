@@ -10,4 +10,21 @@ DEFAULT_EXTENSIONS = {
     "video": [".mp4", ".mkv", ".avi", ".mov", ".wmv"],
     "image": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff"],
     "ebook": [".epub", ".pdf", ".mobi", ".azw", ".azw3", ".fb2"],
-} 
\ No newline at end of file
+}
+
+
+def get_extension_map(extensions_by_type):
+    """
+    Build a lookup table from lower-case extension to media type.
+
+    Args:
+        extensions_by_type: Dictionary of file extensions by media type
+
+    Returns:
+        Dictionary mapping each extension to the first media type that lists it
+    """
+    extension_map = {}
+    for media_type, extensions_list in extensions_by_type.items():
+        for ext in extensions_list:
+            extension_map.setdefault(ext.lower(), media_type)
+    return extension_map
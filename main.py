@@ -4,6 +4,9 @@ Archimedius - A tool to organize media files based on metadata.
 """
 
 import logging
+import logging.handlers
+import multiprocessing
+import queue
 from pathlib import Path
 import json
 from ttkbootstrap import Window
@@ -12,19 +15,41 @@ from ttkbootstrap import Window
 import defaults
 from archimedius_gui import ArchimediusGUI
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(), logging.FileHandler("archimedius.log")],
-)
 logger = logging.getLogger("Archimedius")
 
-# Set PyPDF logger to ERROR level to suppress warnings
-logging.getLogger("pypdf").setLevel(logging.ERROR)
+
+def configure_logging():
+    """
+    Send log records to the console and log file through a background listener.
+
+    Records are written by the listener so that logging from the worker threads never
+    waits on console or file I/O. This runs from main() rather than at import time,
+    since the metadata worker processes import this module again when they start.
+
+    Returns:
+        Tuple of (list of console and file handlers, listener that must be started)
+    """
+    log_handlers = [logging.StreamHandler(), logging.FileHandler("archimedius.log")]
+    for log_handler in log_handlers:
+        log_handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        )
+    log_queue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(
+        log_queue, *log_handlers, respect_handler_level=True
+    )
+    logging.root.setLevel(logging.INFO)
+    logging.root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    # Set PyPDF logger to ERROR level to suppress warnings
+    logging.getLogger("pypdf").setLevel(logging.ERROR)
+    return log_handlers, log_listener
+
 
 def main():
     """Main entry point for the application."""
+    log_handlers, log_listener = configure_logging()
+    log_listener.start()
     # Try to load logging level from settings file
     config_file = Path.home() / defaults.DEFAULT_PATHS["settings_file"]
     if config_file.exists():
@@ -35,7 +60,7 @@ def main():
                 numeric_level = defaults.LOGGING_LEVELS.get(logging_level, logging.INFO)
                 logger.setLevel(numeric_level)
                 # Also update the root logger for the file handler
-                for handler in logging.root.handlers:
+                for handler in log_handlers:
                     if isinstance(handler, logging.FileHandler):
                         handler.setLevel(numeric_level)
                 
@@ -46,8 +71,14 @@ def main():
     
     root = Window(themename="flatly")
     app = ArchimediusGUI(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        # Flush any queued records before exiting
+        log_listener.stop()
 
 
 if __name__ == "__main__":
+    # Needed for the metadata worker processes in frozen (PyInstaller/py2app) builds
+    multiprocessing.freeze_support()
     main() 
@@ -7,8 +7,10 @@ Provides a class for handling media files and extracting metadata.
 import os
 import re
 import logging
+import multiprocessing
+import time
+import functools
 from pathlib import Path
-from datetime import datetime
 
 # Import required libraries for metadata extraction
 from tinytag import TinyTag
@@ -16,6 +18,8 @@ from PIL import Image
 
 # Import the defaults module
 import defaults
+# Import the extensions module
+import extensions
 
 # Configure logging
 logger = logging.getLogger("MediaOrganizer")
@@ -26,59 +30,422 @@ try:
     MEDIAINFO_AVAILABLE = True
 except (ImportError, OSError):
     MEDIAINFO_AVAILABLE = False
-    logging.warning(
-        "pymediainfo or MediaInfo not available. Video metadata extraction will be limited."
+    # Spawned metadata workers import this module too; only the main process reports it
+    if multiprocessing.current_process().name == "MainProcess":
+        logging.warning(
+            "pymediainfo or MediaInfo not available. Video metadata extraction will be limited."
+        )
+
+# Stored with cached metadata; bump the number when extraction changes so older
+# entries are read again. Whether MediaInfo is available changes what videos yield.
+METADATA_CACHE_VERSION = f"1:{int(MEDIAINFO_AVAILABLE)}"
+
+# Sentinel for metadata fields that were never extracted
+_MISSING = object()
+
+# Placeholder text for metadata that could not be determined
+_UNKNOWN = "Unknown"
+# Values that are formatted as _UNKNOWN
+_EMPTY_SENTINELS = frozenset(("", _UNKNOWN))
+
+# Metadata fields filled from the file system rather than by reading the file's tags
+_FILE_INFO_FIELDS = frozenset(
+    (
+        "filename",
+        "filename_with_extension",
+        "extension",
+        "file_type",
+        "size",
+        "creation_date",
+        "creation_year",
+        "creation_month",
+        "creation_month_name",
     )
+)
+
+# Patterns used for every file, compiled once
+_YEAR_RE = re.compile(r"\d{4}")
+_PDF_YEAR_RE = re.compile(r"D:(\d{4})")
+# Bytes read from the end of a PDF to find its trailer
+_PDF_TAIL_SIZE = 8192
+# Bytes read at a PDF object's offset; document information dictionaries are small
+_PDF_OBJECT_SIZE = 8192
+_PDF_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_PDF_INFO_REF_RE = re.compile(rb"/Info\s+(\d+)\s+(\d+)\s+R")
+_PDF_PREV_RE = re.compile(rb"/Prev\s+(\d+)")
+_PDF_NAME_RE = re.compile(rb"/([^\s/<>\[\]()]*)")
+_PDF_OCTAL_RE = re.compile(rb"[0-7]{1,3}")
+# Document information entries copied into the metadata
+_PDF_INFO_KEYS = ("/Title", "/Author", "/Producer", "/CreationDate")
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+# Characters that are problematic in file paths
+_UNSAFE_PATH_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Audio fields that come from the audio stream rather than the tags
+_AUDIO_STREAM_FIELDS = frozenset(("duration", "bitrate", "sample_rate"))
+
+# EPUB package elements copied into the metadata by local name, mapped to their metadata
+# fields; matching without the namespace also covers packages with a nonstandard Dublin Core URI
+_EPUB_DC_FIELDS = {
+    "title": "title",
+    "creator": "author",
+    "date": "year",
+    "publisher": "publisher",
+    "language": "language",
+    "identifier": "isbn",
+}
+_OPF_SCHEME_ATTR = "{http://www.idpf.org/2007/opf}scheme"
+_EPUB_CONTAINER_NS = "{urn:oasis:names:tc:opendocument:xmlns:container}"
+
+# FictionBook title-info elements copied into the metadata, mapped to their metadata fields
+_FB2_FIELDS = {
+    "book-title": "title",
+    "genre": "genre",
+    "lang": "language",
+    "date": "year",
+}
+
+# EXIF tags copied into the metadata, mapped to their readable names
+_EXIF_TAGS = {
+    271: "camera_make",
+    272: "camera_model",
+    306: "date_time",
+    36867: "date_taken",
+    33432: "copyright",
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_template(template):
+    """
+    Parse a path template once and cache the result.
+
+    Args:
+        template: String template with placeholders for metadata fields
+
+    Returns:
+        Tuple of (segments, unique placeholder names, whether the formatted path is
+        already normalized). Segments alternate literal text and placeholder names,
+        starting and ending with literal text.
+    """
+    segments = tuple(re.split(r"{([^{}]+)}", template))
+    placeholders = tuple(dict.fromkeys(segments[1::2]))
+    # Substituted values are sanitized and never empty, so only the literal
+    # text can produce repeated separators, "." segments or trailing slashes.
+    skeleton = "x".join(segments[0::2])
+    is_normalized = bool(skeleton) and os.path.normpath(skeleton) == skeleton
+    return segments, placeholders, is_normalized
+
+
+def _format_duration(seconds):
+    """Format a duration in seconds as minutes:seconds (e.g. 3:07)."""
+    return f"{int(seconds // 60)}:{int(seconds % 60):02d}"
+
+
+def get_template_fields(template):
+    """
+    Get the metadata fields used by a path template.
+
+    Args:
+        template: String template with placeholders for metadata fields
+
+    Returns:
+        Frozenset of placeholder names in the template
+    """
+    return frozenset(_parse_template(template)[1])
+
+
+def _read_pdf_info(file_path):
+    """
+    Read a PDF's document information dictionary from its trailer without parsing the document.
+
+    Only the end of the file, the cross-reference entry of the dictionary and the
+    dictionary itself are read. Files that need a full parser (cross-reference
+    streams, encryption, values stored in other objects) return None.
+
+    Args:
+        file_path: Path of the PDF file
+
+    Returns:
+        Dictionary of the string entries keyed by name (e.g. "/Title"), or None
+    """
+    with open(file_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - _PDF_TAIL_SIZE))
+        tail = f.read()
+        startxref = _PDF_STARTXREF_RE.findall(tail)
+        info_refs = _PDF_INFO_REF_RE.findall(tail)
+        if not startxref or not info_refs or b"/Encrypt" in tail:
+            return None
+        # The last trailer in the file belongs to the latest update
+        obj_num, generation = (int(number) for number in info_refs[-1])
+        offset = _find_pdf_object(f, int(startxref[-1]), obj_num)
+        if offset is None:
+            return None
+        f.seek(offset)
+        data = f.read(_PDF_OBJECT_SIZE)
+    match = re.match(rb"\s*(\d+)\s+(\d+)\s+obj\s*<<", data)
+    if match is None or (int(match.group(1)), int(match.group(2))) != (obj_num, generation):
+        return None
+    return _parse_pdf_dict(data, match.end())
+
+
+def _find_pdf_object(f, xref_offset, obj_num):
+    """Get an object's file offset from a PDF's cross-reference tables, or None if not found."""
+    seen = set()
+    while xref_offset not in seen:
+        seen.add(xref_offset)
+        f.seek(xref_offset)
+        if f.readline().strip() != b"xref":
+            # A cross-reference stream, which needs a full parser
+            return None
+        while True:
+            header = f.readline().split()
+            if len(header) != 2:
+                break
+            first, count = int(header[0]), int(header[1])
+            if first <= obj_num < first + count:
+                # Entries are exactly 20 bytes: 10-digit offset, generation and n or f
+                f.seek((obj_num - first) * 20, os.SEEK_CUR)
+                entry = f.read(20).split()
+                if len(entry) != 3 or entry[2] != b"n":
+                    return None
+                return int(entry[0])
+            f.seek(count * 20, os.SEEK_CUR)
+        # Not in this section; earlier updates are linked from the trailer
+        prev = _PDF_PREV_RE.search(f.read(_PDF_TAIL_SIZE))
+        if prev is None:
+            return None
+        xref_offset = int(prev.group(1))
+    return None
+
+
+def _parse_pdf_dict(data, pos):
+    """
+    Parse the string entries of a PDF dictionary.
+
+    Entries inside nested dictionaries and arrays are skipped.
+
+    Args:
+        data: Bytes containing the dictionary
+        pos: Position just after the dictionary's opening <<
+
+    Returns:
+        Dictionary of decoded strings keyed by name, or None if a value is stored
+        in another object
+    """
+    values = {}
+    # Nesting of dictionaries and arrays inside this dictionary
+    depth = 0
+    end = len(data)
+    while pos < end:
+        if data.startswith(b"<<", pos):
+            depth += 1
+            pos += 2
+            continue
+        if data.startswith(b">>", pos):
+            if depth == 0:
+                return values
+            depth -= 1
+            pos += 2
+            continue
+        char = data[pos : pos + 1]
+        if char == b"[":
+            depth += 1
+            pos += 1
+        elif char == b"]":
+            depth -= 1
+            pos += 1
+        elif char == b"/":
+            match = _PDF_NAME_RE.match(data, pos)
+            pos = match.end()
+            if depth:
+                continue
+            key = "/" + match.group(1).decode("latin-1")
+            while data[pos : pos + 1].isspace():
+                pos += 1
+            if data.startswith(b"(", pos):
+                value, pos = _read_pdf_literal(data, pos)
+                values[key] = _decode_pdf_text(value)
+            elif data.startswith(b"<", pos) and not data.startswith(b"<<", pos):
+                value, pos = _read_pdf_hex(data, pos)
+                values[key] = _decode_pdf_text(value)
+            elif data.startswith(b"/", pos):
+                # A name value, which is not a key
+                pos = _PDF_NAME_RE.match(data, pos).end()
+            elif re.match(rb"\d+\s+\d+\s+R", data[pos : pos + 32]):
+                # An indirect reference would need another lookup
+                return None
+        elif char == b"(":
+            _, pos = _read_pdf_literal(data, pos)
+        elif char == b"<":
+            _, pos = _read_pdf_hex(data, pos)
+        else:
+            pos += 1
+    raise ValueError("PDF dictionary is not terminated")
+
+
+def _read_pdf_hex(data, pos):
+    """Read a PDF hexadecimal string starting at its opening bracket; return (bytes, end)."""
+    close = data.index(b">", pos)
+    hex_digits = b"".join(data[pos + 1 : close].split())
+    if len(hex_digits) % 2:
+        hex_digits += b"0"
+    return bytes.fromhex(hex_digits.decode("ascii")), close + 1
+
+
+def _read_pdf_literal(data, pos):
+    """Read a PDF literal string starting at its opening parenthesis; return (bytes, end)."""
+    out = bytearray()
+    depth = 0
+    pos += 1
+    end = len(data)
+    while pos < end:
+        char = data[pos : pos + 1]
+        if char == b"\\":
+            escaped = data[pos + 1 : pos + 2]
+            octal = _PDF_OCTAL_RE.match(data, pos + 1)
+            if escaped in _PDF_ESCAPES:
+                out += _PDF_ESCAPES[escaped]
+                pos += 2
+            elif octal:
+                out.append(int(octal.group(0), 8) & 0xFF)
+                pos = octal.end()
+            elif escaped in (b"\r", b"\n"):
+                # A backslash at the end of a line continues the string
+                pos += 3 if data.startswith(b"\r\n", pos + 1) else 2
+            else:
+                out += escaped
+                pos += 2
+            continue
+        if char == b"(":
+            depth += 1
+        elif char == b")":
+            if depth == 0:
+                return bytes(out), pos + 1
+            depth -= 1
+        out += char
+        pos += 1
+    raise ValueError("PDF string is not terminated")
+
+
+def _decode_pdf_text(value):
+    """Decode a PDF text string (UTF-16 or UTF-8 with a byte order mark, else PDFDocEncoding)."""
+    if value.startswith(b"\xfe\xff"):
+        return value[2:].decode("utf-16-be", errors="replace")
+    if value.startswith(b"\xef\xbb\xbf"):
+        return value[3:].decode("utf-8", errors="replace")
+    # PDFDocEncoding matches Latin-1 for the characters used in titles and names
+    return value.decode("latin-1")
+
 
 class MediaFile:
     """Class to represent a media file with its metadata."""
+
+    # One MediaFile is created per file, so skip the per-instance __dict__
+    __slots__ = (
+        "file_path",
+        "metadata",
+        "supported_extensions",
+        "file_type",
+        "needed_fields",
+        "file_stat",
+        "cache_entry",
+    )
     
-    def __init__(self, file_path, supported_extensions):
+    def __init__(
+        self,
+        file_path,
+        supported_extensions,
+        extension_map=None,
+        fields_by_type=None,
+        metadata_cache=None,
+    ):
         """
         Initialize a MediaFile object.
         
         Args:
             file_path: Path to the media file
             supported_extensions: Dictionary of supported file extensions by media type
+            extension_map: Optional extension to media type lookup built with
+                extensions.get_extension_map; pass it when creating many files
+            fields_by_type: Optional dictionary of the metadata fields needed for each
+                media type (see get_template_fields); the file's tags are not read
+                when only file information is needed
+            metadata_cache: Optional MetadataCache; the file's contents are only read
+                if it has nothing stored for the file's current size and modification time
         """
         self.file_path = Path(file_path)
         self.metadata = {}
+        # Result of stat() on the file, fetched once when first needed
+        self.file_stat = None
+        # Entry for MetadataCache.put_many when the contents were read rather than cached
+        self.cache_entry = None
         self.supported_extensions = supported_extensions
-        self.file_type = self._get_file_type()
-        self.extract_metadata()
+        if extension_map is None:
+            extension_map = extensions.get_extension_map(supported_extensions)
+        self.file_type = self._get_file_type(extension_map)
+        self.needed_fields = fields_by_type.get(self.file_type) if fields_by_type else None
+        self.extract_metadata(metadata_cache)
         
-    def _get_file_type(self):
+    def _get_stat(self):
+        """Get the file's stat result, calling stat() only once per file."""
+        if self.file_stat is None:
+            self.file_stat = self.file_path.stat()
+        return self.file_stat
+
+    def _get_file_type(self, extension_map):
         """Determine the type of media file."""
-        ext = self.file_path.suffix.lower()
-        for file_type, extensions_list in self.supported_extensions.items():
-            if ext in extensions_list:
-                return file_type
-        return "unknown"
+        return extension_map.get(self.file_path.suffix.lower(), "unknown")
     
-    def extract_metadata(self):
-        """Extract metadata from the media file."""
+    def extract_metadata(self, metadata_cache=None):
+        """
+        Extract metadata from the media file.
+
+        Args:
+            metadata_cache: Optional MetadataCache to reuse metadata read by an earlier run
+        """
         try:
-            if self.file_type == "audio":
-                self._extract_audio_metadata()
-            elif self.file_type == "video":
-                self._extract_video_metadata()
-            elif self.file_type == "image":
-                self._extract_image_metadata()
-            elif self.file_type == "ebook":
-                self._extract_ebook_metadata()
+            extractor = self._EXTRACTORS.get(self.file_type)
+            if extractor is not None and (
+                self.needed_fields is None or not self.needed_fields <= _FILE_INFO_FIELDS
+            ):
+                if metadata_cache is None:
+                    extractor(self)
+                else:
+                    file_stat = self._get_stat()
+                    cached = metadata_cache.get(
+                        self.file_path, file_stat, self.needed_fields, METADATA_CACHE_VERSION
+                    )
+                    if cached is not None:
+                        self.metadata.update(cached)
+                    elif extractor(self):
+                        # Only complete results are stored, so files that failed to read
+                        # are tried again; file information is cheap and never stored
+                        self.cache_entry = metadata_cache.make_entry(
+                            self.file_path,
+                            file_stat,
+                            self.needed_fields,
+                            self.metadata,
+                            METADATA_CACHE_VERSION,
+                        )
             
             # Add file information
             self.metadata["filename"] = self.file_path.stem
             self.metadata["filename_with_extension"] = self.file_path.name
             self.metadata["extension"] = self.file_path.suffix.lower()[1:]  # Remove the dot
-            self.metadata["size"] = self.file_path.stat().st_size
-
-            # Extract creation date information
-            creation_time = datetime.fromtimestamp(self.file_path.stat().st_ctime)
-            self.metadata["creation_date"] = creation_time.strftime("%Y-%m-%d")
-            self.metadata["creation_year"] = creation_time.strftime("%Y")
-            self.metadata["creation_month"] = creation_time.strftime("%m")  # Numeric month (01-12)
-            self.metadata["creation_month_name"] = creation_time.strftime("%B")  # Full month name
+            file_stat = self._get_stat()
+            self.metadata["size"] = file_stat.st_size
+
+            # Extract creation date information; time.strftime formats the struct_time
+            # from localtime without building a datetime object for every file
+            creation_time = time.localtime(file_stat.st_ctime)
+            # One strftime call; the year and month are sliced out of the YYYY-MM-DD date
+            creation_date, month_name = time.strftime("%Y-%m-%d|%B", creation_time).split("|", 1)
+            self.metadata["creation_date"] = creation_date
+            self.metadata["creation_year"] = creation_date[:4]
+            self.metadata["creation_month"] = creation_date[5:7]  # Numeric month (01-12)
+            self.metadata["creation_month_name"] = month_name  # Full month name
             
         except Exception as e:
             logger.error(f"Error extracting metadata from {self.file_path}: {e}")
@@ -101,8 +468,13 @@ class MediaFile:
         )
 
         try:
+            # Working out the duration can mean scanning the whole audio stream (e.g. MP3s
+            # without a VBR header), so it is skipped unless the template uses it
+            read_stream = self.needed_fields is None or not self.needed_fields.isdisjoint(
+                _AUDIO_STREAM_FIELDS
+            )
             # TinyTag supports MP3, OGG, OPUS, FLAC, WMA, MP4/M4A/AAC, and WAV
-            tag = TinyTag.get(self.file_path)
+            tag = TinyTag.get(self.file_path, duration=read_stream)
             
             # Extract common metadata
             if tag.title:
@@ -120,21 +492,21 @@ class MediaFile:
             
             # Audio-specific information
             if tag.duration:
-                minutes = int(tag.duration // 60)
-                seconds = int(tag.duration % 60)
-                self.metadata["duration"] = f"{minutes}:{seconds:02d}"
+                self.metadata["duration"] = _format_duration(tag.duration)
             if tag.bitrate:
                 self.metadata["bitrate"] = f"{int(tag.bitrate)} kbps"
             if tag.samplerate:
                 self.metadata["sample_rate"] = f"{int(tag.samplerate / 1000)} kHz"
             
-            logger.info(f"Extracted audio metadata for {self.file_path}")
+            logger.debug("Extracted audio metadata for %s", self.file_path)
+            return True
             
         except Exception as e:
             logger.error(f"Error in audio metadata extraction for {self.file_path}: {e}")
             # Ensure we have at least basic metadata
             if "title" not in self.metadata:
                 self.metadata["title"] = self.file_path.stem
+            return False
             
     def _extract_video_metadata(self):
         """Extract metadata from video files."""
@@ -164,11 +536,10 @@ class MediaFile:
                         if hasattr(track, "genre") and track.genre:
                             self.metadata["genre"] = track.genre
                         if hasattr(track, "duration") and track.duration:
-                            # Convert milliseconds to minutes:seconds
-                            duration_ms = float(track.duration)
-                            minutes = int(duration_ms / 60000)
-                            seconds = int((duration_ms % 60000) / 1000)
-                            self.metadata["duration"] = f"{minutes}:{seconds:02d}"
+                            # MediaInfo reports milliseconds
+                            self.metadata["duration"] = _format_duration(
+                                float(track.duration) / 1000
+                            )
 
                     # Get video track info
                     elif track.track_type == "Video":
@@ -183,14 +554,17 @@ class MediaFile:
                         if hasattr(track, "bit_depth") and track.bit_depth:
                             self.metadata["bit_depth"] = track.bit_depth
 
-                logger.info(f"Extracted video metadata for {self.file_path}")
+                logger.debug("Extracted video metadata for %s", self.file_path)
+                return True
             except Exception as e:
                 logger.error(f"Error extracting video metadata: {e}")
+                return False
         else:
-            logger.warning(f"MediaInfo not available. Limited metadata for {self.file_path}")
+            # Missing MediaInfo is reported once at import rather than for every video
+            logger.debug("MediaInfo not available. Limited metadata for %s", self.file_path)
             # Set some basic metadata based on file properties
-            self.metadata["year"] = datetime.fromtimestamp(self.file_path.stat().st_mtime).strftime(
-                "%Y"
+            self.metadata["year"] = time.strftime(
+                "%Y", time.localtime(self._get_stat().st_mtime)
             )
             
             # Try to use TinyTag for basic video metadata if possible
@@ -205,12 +579,12 @@ class MediaFile:
                 if tag.year:
                     self.metadata["year"] = str(tag.year)
                 if tag.duration:
-                    minutes = int(tag.duration // 60)
-                    seconds = int(tag.duration % 60)
-                    self.metadata["duration"] = f"{minutes}:{seconds:02d}"
+                    self.metadata["duration"] = _format_duration(tag.duration)
             except:
                 # Silently fail if TinyTag can't handle the video format
                 pass
+            # Limited metadata; read again once MediaInfo is available
+            return False
         
     def _extract_image_metadata(self):
         """Extract metadata from image files."""
@@ -221,25 +595,17 @@ class MediaFile:
                 self.metadata["format"] = img.format
                 self.metadata["mode"] = img.mode
                 
-                # Extract EXIF data if available
-                if hasattr(img, "_getexif") and img._getexif():
-                    exif = img._getexif()
-                    if exif:
-                        # Map EXIF tags to readable names
-                        exif_tags = {
-                            271: "camera_make",
-                            272: "camera_model",
-                            306: "date_time",
-                            36867: "date_taken",
-                            33432: "copyright",
-                        }
-                        
-                        for tag, value in exif.items():
-                            if tag in exif_tags:
-                                self.metadata[exif_tags[tag]] = value
+                # Extract EXIF data if available; _getexif parses the whole block, so call it once
+                exif = img._getexif() if hasattr(img, "_getexif") else None
+                if exif:
+                    for tag, name in _EXIF_TAGS.items():
+                        if tag in exif:
+                            self.metadata[name] = exif[tag]
+            return True
         
         except Exception as e:
             logger.error(f"Error extracting image metadata from {self.file_path}: {e}")
+            return False
 
     def _extract_ebook_metadata(self):
         """Extract metadata from ebook files."""
@@ -254,120 +620,205 @@ class MediaFile:
             "language": "Unknown",
         })
 
-        ext = self.file_path.suffix.lower()
+        reader = self._EBOOK_READERS.get(self.file_path.suffix.lower())
+        if reader is None:
+            return True
+        try:
+            return reader(self)
+        except Exception as e:
+            logger.error(f"Error in ebook metadata extraction for {self.file_path}: {e}")
+            return False
 
+    def _read_pdf_metadata(self):
+        """Read title, author, publisher and year from a PDF's document information."""
         try:
-            # PDF files
-            if ext == ".pdf":
-                try:
-                    from pypdf import PdfReader
-                    reader = PdfReader(self.file_path)
-                    info = reader.metadata
-                    if info:
-                        if info.get("/Title"):
-                            self.metadata["title"] = info["/Title"]
-                        if info.get("/Author"):
-                            self.metadata["author"] = info["/Author"]
-                        if info.get("/Producer"):
-                            self.metadata["publisher"] = info["/Producer"]
-                        if info.get("/CreationDate"):
-                            # Try to extract year from PDF creation date
-                            date_str = info["/CreationDate"]
-                            year_match = re.search(r"D:(\d{4})", date_str)
-                            if year_match:
-                                self.metadata["year"] = year_match.group(1)
-                except ImportError:
-                    logger.warning("PyPDF not available. Limited PDF metadata extraction.")
-                except Exception as e:
-                    logger.error(f"Error extracting PDF metadata from {self.file_path}: {e}")
+            # Reading the trailer directly avoids parsing the whole cross-reference
+            # table and object streams; pypdf handles the files it can't
+            try:
+                info = _read_pdf_info(self.file_path)
+            except Exception as e:
+                logger.debug("Could not read PDF trailer of %s: %s", self.file_path, e)
+                info = None
+            if not info or not any(info.get(key) for key in _PDF_INFO_KEYS):
+                from pypdf import PdfReader
+                reader = PdfReader(self.file_path)
+                info = reader.metadata
+            if info:
+                if info.get("/Title"):
+                    self.metadata["title"] = info["/Title"]
+                if info.get("/Author"):
+                    self.metadata["author"] = info["/Author"]
+                if info.get("/Producer"):
+                    self.metadata["publisher"] = info["/Producer"]
+                if info.get("/CreationDate"):
+                    # Try to extract year from PDF creation date
+                    date_str = info["/CreationDate"]
+                    year_match = _PDF_YEAR_RE.search(date_str)
+                    if year_match:
+                        self.metadata["year"] = year_match.group(1)
+            return True
+        except ImportError:
+            logger.warning("PyPDF not available. Limited PDF metadata extraction.")
+            return False
+        except Exception as e:
+            logger.error(f"Error extracting PDF metadata from {self.file_path}: {e}")
+            return False
 
-            # EPUB files
-            elif ext == ".epub":
-                try:
-                    import zipfile
-                    from xml.etree import ElementTree as ET
-                    
-                    with zipfile.ZipFile(self.file_path) as epub:
-                        # Try to find and parse the OPF file
-                        for name in epub.namelist():
-                            if name.endswith(".opf"):
-                                with epub.open(name) as opf:
-                                    tree = ET.parse(opf)
-                                    root = tree.getroot()
-                                    
-                                    # Define XML namespaces
-                                    ns = {
-                                        'dc': 'http://purl.org/dc/elements/1.1/',
-                                        'opf': 'http://www.idpf.org/2007/opf'
-                                    }
-                                    
-                                    # Extract metadata
-                                    metadata = root.find('.//{http://www.idpf.org/2007/opf}metadata')
-                                    if metadata is not None:
-                                        title = metadata.find('.//dc:title', ns)
-                                        if title is not None and title.text:
-                                            self.metadata["title"] = title.text
-                                            
-                                        creator = metadata.find('.//dc:creator', ns)
-                                        if creator is not None and creator.text:
-                                            self.metadata["author"] = creator.text
-                                            
-                                        date = metadata.find('.//dc:date', ns)
-                                        if date is not None and date.text:
-                                            # Try to extract year from date
-                                            year_match = re.search(r"\d{4}", date.text)
-                                            if year_match:
-                                                self.metadata["year"] = year_match.group(0)
-                                                
-                                        publisher = metadata.find('.//dc:publisher', ns)
-                                        if publisher is not None and publisher.text:
-                                            self.metadata["publisher"] = publisher.text
-                                            
-                                        language = metadata.find('.//dc:language', ns)
-                                        if language is not None and language.text:
-                                            self.metadata["language"] = language.text
-                                            
-                                        identifier = metadata.find('.//dc:identifier', ns)
-                                        if identifier is not None and identifier.text:
-                                            # Check if it's an ISBN
-                                            if "isbn" in identifier.get("{http://www.idpf.org/2007/opf}scheme", "").lower() or re.search(r"isbn", identifier.text, re.I):
-                                                self.metadata["isbn"] = identifier.text
-                                break
-                except Exception as e:
-                    logger.error(f"Error extracting EPUB metadata from {self.file_path}: {e}")
+    def _read_epub_metadata(self):
+        """Read Dublin Core metadata from an EPUB's OPF package file."""
+        try:
+            import zipfile
+            from xml.etree import ElementTree as ET
 
-            # MOBI files
-            elif ext in [".mobi", ".azw", ".azw3"]:
-                try:
-                    # Try to use mobi-python if available
-                    import mobi
-                    book = mobi.Mobi(self.file_path)
-                    book.parse()
-                    
-                    if book.title:
-                        self.metadata["title"] = book.title
-                    if book.author:
-                        self.metadata["author"] = book.author
-                    if book.publisher:
-                        self.metadata["publisher"] = book.publisher
-                    
-                    # Try to extract year from publication date if available
-                    if hasattr(book, "publication_date") and book.publication_date:
-                        year_match = re.search(r"\d{4}", book.publication_date)
-                        if year_match:
-                            self.metadata["year"] = year_match.group(0)
-                            
-                except ImportError:
-                    logger.warning("mobi-python not available. Limited MOBI metadata extraction.")
-                except Exception as e:
-                    logger.error(f"Error extracting MOBI metadata from {self.file_path}: {e}")
+            with zipfile.ZipFile(self.file_path) as epub:
+                opf_path = self._find_epub_package(epub)
+                if opf_path is None:
+                    return True
+                found = set()
+                with epub.open(opf_path) as opf:
+                    # Stream the package file and stop at the end of the metadata block,
+                    # which comes first, instead of building the whole tree (manifest, spine)
+                    for _, elem in ET.iterparse(opf):
+                        tag = elem.tag.rpartition("}")[2]
+                        if tag == "metadata":
+                            break
+                        # The first element of each kind is used
+                        if tag in _EPUB_DC_FIELDS and tag not in found and elem.text:
+                            found.add(tag)
+                            self._set_epub_field(_EPUB_DC_FIELDS[tag], elem)
+                        elem.clear()
+            return True
+        except Exception as e:
+            logger.error(f"Error extracting EPUB metadata from {self.file_path}: {e}")
+            return False
+
+    @staticmethod
+    def _find_epub_package(epub):
+        """Get the path of an EPUB's OPF package file, or None if there isn't one."""
+        from xml.etree import ElementTree as ET
+
+        # The container file names the package directly, so the archive listing isn't searched
+        try:
+            container = ET.fromstring(epub.read("META-INF/container.xml"))
+            rootfile = container.find(f".//{_EPUB_CONTAINER_NS}rootfile")
+            if rootfile is not None and rootfile.get("full-path"):
+                return rootfile.get("full-path")
+        except (KeyError, ET.ParseError):
+            # Missing or broken container file
+            pass
+        for name in epub.namelist():
+            if name.endswith(".opf"):
+                return name
+        return None
+
+    def _set_epub_field(self, field, elem):
+        """Store an EPUB Dublin Core element's text as a metadata field."""
+        text = elem.text
+        if field == "year":
+            # Try to extract year from date
+            year_match = _YEAR_RE.search(text)
+            if year_match:
+                self.metadata["year"] = year_match.group(0)
+        elif field == "isbn":
+            # Check if it's an ISBN
+            if "isbn" in elem.get(_OPF_SCHEME_ATTR, "").lower() or "isbn" in text.lower():
+                self.metadata["isbn"] = text
+        else:
+            self.metadata[field] = text
+
+    def _read_fb2_metadata(self):
+        """Read title, author, genre, language and year from a FictionBook title-info block."""
+        try:
+            from xml.etree import ElementTree as ET
+
+            authors = []
+            author_parts = []
+            found = set()
+            with open(self.file_path, "rb") as fb2:
+                # The description comes before the book's body, so parsing stops at its end
+                for _, elem in ET.iterparse(fb2):
+                    tag = elem.tag.rpartition("}")[2]
+                    if tag == "title-info":
+                        break
+                    if tag in ("first-name", "middle-name", "last-name") and elem.text:
+                        author_parts.append(elem.text.strip())
+                    elif tag == "author":
+                        if author_parts:
+                            authors.append(" ".join(author_parts))
+                            author_parts = []
+                    elif tag in _FB2_FIELDS and tag not in found and elem.text:
+                        found.add(tag)
+                        field = _FB2_FIELDS[tag]
+                        if field == "year":
+                            year_match = _YEAR_RE.search(elem.get("value") or elem.text)
+                            if year_match:
+                                self.metadata["year"] = year_match.group(0)
+                        else:
+                            self.metadata[field] = elem.text.strip()
+                    elem.clear()
+            if authors:
+                self.metadata["author"] = authors[0]
+            return True
+        except Exception as e:
+            logger.error(f"Error extracting FB2 metadata from {self.file_path}: {e}")
+            return False
+
+    def _read_mobi_metadata(self):
+        """Read title, author, publisher and year from a MOBI/AZW header."""
+        try:
+            # Try to use mobi-python if available
+            import mobi
+            book = mobi.Mobi(self.file_path)
+            book.parse()
+            
+            if book.title:
+                self.metadata["title"] = book.title
+            if book.author:
+                self.metadata["author"] = book.author
+            if book.publisher:
+                self.metadata["publisher"] = book.publisher
+            
+            # Try to extract year from publication date if available
+            if hasattr(book, "publication_date") and book.publication_date:
+                year_match = _YEAR_RE.search(book.publication_date)
+                if year_match:
+                    self.metadata["year"] = year_match.group(0)
+            return True
                     
+        except ImportError:
+            logger.warning("mobi-python not available. Limited MOBI metadata extraction.")
+            return False
         except Exception as e:
-            logger.error(f"Error in ebook metadata extraction for {self.file_path}: {e}")
+            logger.error(f"Error extracting MOBI metadata from {self.file_path}: {e}")
+            return False
+
+    # Ebook metadata reader for each extension; like the extractors, each returns
+    # whether the file's contents could be read
+    _EBOOK_READERS = {
+        ".pdf": _read_pdf_metadata,
+        ".epub": _read_epub_metadata,
+        ".mobi": _read_mobi_metadata,
+        ".azw": _read_mobi_metadata,
+        ".azw3": _read_mobi_metadata,
+        ".fb2": _read_fb2_metadata,
+    }
             
+    # Metadata extractor for each media type; each returns True if the file's contents
+    # were read, or False if it fell back to defaults (such results are not cached)
+    _EXTRACTORS = {
+        "audio": _extract_audio_metadata,
+        "video": _extract_video_metadata,
+        "image": _extract_image_metadata,
+        "ebook": _extract_ebook_metadata,
+    }
+
     def get_formatted_path(self, template, exclude_unknown=False):
         """
         Format the destination path using the template and metadata.
+
+        This is string and dict work, so JIT compilers such as Numba would only
+        run it in object mode and be slower than plain CPython. If profiling ever
+        shows it as the bottleneck, a small compiled helper is the way to go.
         
         Args:
             template: String template with placeholders for metadata fields
@@ -376,64 +827,85 @@ class MediaFile:
         Returns:
             Formatted path string
         """
-        try:
-            # Replace placeholders with metadata values
-            formatted_path = template
-            
-            # Add file_type to metadata for template use
-            self.metadata["file_type"] = self.file_type
-            
-            # Replace each placeholder with its corresponding metadata value
-            for key, value in self.metadata.items():
-                placeholder = "{" + key + "}"
-                if placeholder in formatted_path:
-                    # Convert value to string and sanitize for use in filenames
+        # Add file_type to metadata for template use
+        self.metadata["file_type"] = self.file_type
+
+        # File information may be missing if extraction failed part-way through
+        filename_with_extension = self.metadata.get(
+            "filename_with_extension", self.file_path.name
+        )
+        extension = self.metadata.get("extension", self.file_path.suffix.lower()[1:])
+
+        segments, placeholders, is_normalized = _parse_template(template)
+        needs_normpath = not is_normalized
+
+        # Work out the value for each placeholder once, even if it is used several times
+        values = {}
+        for key in placeholders:
+            value = self.metadata.get(key, _MISSING)
+            if value is _MISSING:
+                values[key] = _UNKNOWN
+                continue
+            # Tag libraries mostly hand back strings already
+            if isinstance(value, str):
+                str_value = value
+            else:
+                try:
                     str_value = str(value)
-                    # Replace characters that are problematic in file paths
-                    sanitized = re.sub(r'[<>:"/\\|?*]', '_', str_value)
-                    formatted_path = formatted_path.replace(placeholder, sanitized)
-            
-            # Replace any remaining placeholders with "Unknown"
-            formatted_path = re.sub(r'{[^{}]+}', 'Unknown', formatted_path)
-            
-            # If exclude_unknown is True, remove "Unknown" folders from the path
-            if exclude_unknown:
-                # Split on both separator styles so templates using "/" also work on Windows.
-                path_parts = re.split(r"[\\/]+", formatted_path)
-                # Filter out "Unknown" parts
-                path_parts = [part for part in path_parts if part != "Unknown"]
-                # Rejoin the path
-                formatted_path = os.sep.join(path_parts)
-                # If the path is now empty, use the file_type as a fallback
-                if not formatted_path:
-                    formatted_path = self.file_type
-            
-            # Ensure the path ends with the original filename if not already included
-            if "{filename}" not in template and "{filename}.{extension}" not in template:
-                if formatted_path.endswith(".{extension}"):
-                    # Replace just the extension placeholder
-                    formatted_path = formatted_path.replace(".{extension}", f".{self.metadata['extension']}")
-                else:
-                    # Add the full filename with extension
-                    formatted_path = os.path.join(
-                        formatted_path, f"{self.metadata['filename_with_extension']}"
-                    )
-            elif "{filename}" in template and "{extension}" not in template:
-                # If filename is included but extension isn't, add the extension
-                base_dir = os.path.dirname(formatted_path)
-                base_name = os.path.basename(formatted_path)
-                extension = self.metadata["extension"]
-                expected_suffix = f".{extension.lower()}"
-                if not base_name.lower().endswith(expected_suffix):
-                    base_name = f"{base_name}.{extension}"
-                    formatted_path = os.path.join(base_dir, base_name) if base_dir else base_name
-            
-            # Clean up any double slashes or other path issues
+                except Exception as e:
+                    logger.error(f"Error formatting {key} for {self.file_path}: {e}")
+                    values[key] = _UNKNOWN
+                    continue
+            stripped = str_value.strip()
+            if stripped in _EMPTY_SENTINELS:
+                # Blank values are treated like missing ones
+                values[key] = _UNKNOWN
+            else:
+                # Replace characters that are problematic in file paths
+                sanitized = _UNSAFE_PATH_CHARS_RE.sub("_", str_value)
+                if sanitized in (".", ".."):
+                    needs_normpath = True
+                values[key] = sanitized
+
+        # Join the literal text with the values in a single pass
+        parts = list(segments)
+        parts[1::2] = [values[key] for key in segments[1::2]]
+        formatted_path = "".join(parts)
+        
+        # If exclude_unknown is True, remove "Unknown" folders from the path
+        if exclude_unknown:
+            # Split on both separator styles so templates using "/" also work on Windows.
+            if "\\" in formatted_path:
+                formatted_path = formatted_path.replace("\\", "/")
+            # Filter out "Unknown" parts and the empty parts left by repeated separators
+            path_parts = [
+                part for part in formatted_path.split("/") if part and part != _UNKNOWN
+            ]
+            # Rejoin the path
+            formatted_path = os.sep.join(path_parts)
+            # If the path is now empty, use the file_type as a fallback
+            if not formatted_path:
+                formatted_path = self.file_type
+        
+        # Ensure the path ends with the original filename if not already included
+        if "{filename}" not in template and "{filename}.{extension}" not in template:
+            if formatted_path.endswith(".{extension}"):
+                # Replace just the extension placeholder
+                formatted_path = formatted_path.replace(".{extension}", f".{extension}")
+            else:
+                # Add the full filename with extension
+                formatted_path = os.path.join(formatted_path, filename_with_extension)
+        elif "{filename}" in template and "{extension}" not in template:
+            # If filename is included but extension isn't, add the extension
+            base_dir = os.path.dirname(formatted_path)
+            base_name = os.path.basename(formatted_path)
+            expected_suffix = f".{extension.lower()}"
+            if not base_name.lower().endswith(expected_suffix):
+                base_name = f"{base_name}.{extension}"
+                formatted_path = os.path.join(base_dir, base_name) if base_dir else base_name
+        
+        # Clean up any double slashes or other path issues
+        if needs_normpath:
             formatted_path = os.path.normpath(formatted_path)
-            
-            return formatted_path
-            
-        except Exception as e:
-            logger.error(f"Error formatting path: {e}")
-            # Fallback to a safe default
-            return os.path.join(self.file_type, self.metadata["filename_with_extension"])
\ No newline at end of file
+        
+        return formatted_path
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Metadata cache module for Archimedius.
+Stores the metadata read from each file in SQLite so later runs only read changed files.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+
+# Configure logging
+logger = logging.getLogger("Archimedius")
+
+# Seconds to wait for another process or thread holding the database lock
+_LOCK_TIMEOUT = 30
+
+# Layout of the metadata table; databases written with another layout are emptied
+_SCHEMA_VERSION = 2
+
+# Shared MetadataCache for each cache file, so worker processes open it once
+_caches = {}
+
+
+def get_cache(cache_file):
+    """
+    Get the MetadataCache for a cache file, creating it on first use in this process.
+
+    Args:
+        cache_file: Path of the SQLite database
+
+    Returns:
+        MetadataCache for the file
+    """
+    cache_file = str(cache_file)
+    cache = _caches.get(cache_file)
+    if cache is None:
+        cache = _caches.setdefault(cache_file, MetadataCache(cache_file))
+    return cache
+
+
+class MetadataCache:
+    """
+    Metadata read from files, keyed by path, size and modification time.
+
+    Each thread gets its own connection, since SQLite connections can't be shared
+    between threads. Lookups are cheap; new entries are meant to be written in
+    batches with put_many once a run is finished, rather than one transaction per file.
+    """
+
+    def __init__(self, cache_file):
+        """
+        Initialize a MetadataCache.
+
+        Args:
+            cache_file: Path of the SQLite database; it is created when first used
+        """
+        self.cache_file = str(cache_file)
+        self._local = threading.local()
+
+    def _connect(self):
+        """Get this thread's connection, opening the database if needed."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.cache_file, timeout=_LOCK_TIMEOUT, isolation_level=None
+            )
+            # WAL lets the worker processes read while a batch is being written
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                self._create_table(connection)
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _create_table(connection):
+        """Create the metadata table, replacing one written with another layout."""
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have upgraded the database while this one waited
+            if connection.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS metadata")
+                connection.execute(
+                    "CREATE TABLE metadata (path TEXT PRIMARY KEY, size INTEGER, "
+                    "mtime INTEGER, version TEXT, fields TEXT, json TEXT)"
+                )
+                connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    @staticmethod
+    def make_entry(file_path, file_stat, needed_fields, metadata, version):
+        """
+        Build a cache entry for put_many.
+
+        Values are stored as strings, which is how they are used in paths.
+
+        Args:
+            file_path: Path of the file
+            file_stat: Stat result of the file
+            needed_fields: Fields the metadata was read for, or None if all were read
+            metadata: Metadata read from the file's contents
+            version: Version of the code that read the metadata; entries written by
+                another version are ignored
+
+        Returns:
+            Tuple of column values
+        """
+        fields = None if needed_fields is None else json.dumps(sorted(needed_fields))
+        values = {
+            key: value if isinstance(value, str) else str(value) for key, value in metadata.items()
+        }
+        return (
+            os.path.abspath(str(file_path)),
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+            version,
+            fields,
+            json.dumps(values),
+        )
+
+    def get(self, file_path, file_stat, needed_fields, version):
+        """
+        Look up the metadata stored for a file.
+
+        Args:
+            file_path: Path of the file
+            file_stat: Current stat result of the file
+            needed_fields: Fields that are needed, or None if all are
+            version: Version of the code reading the metadata (see make_entry)
+
+        Returns:
+            Dictionary of metadata, or None if the file changed, was never stored, was
+            stored by another version, or was stored without some of the needed fields
+        """
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT fields, json FROM metadata "
+                    "WHERE path = ? AND size = ? AND mtime = ? AND version = ?",
+                    (
+                        os.path.abspath(str(file_path)),
+                        file_stat.st_size,
+                        file_stat.st_mtime_ns,
+                        version,
+                    ),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read metadata cache {self.cache_file}: {e}")
+            return None
+        if row is None:
+            return None
+        fields, values = row
+        if fields is not None and (
+            needed_fields is None or not needed_fields <= frozenset(json.loads(fields))
+        ):
+            return None
+        return json.loads(values)
+
+    def put_many(self, entries):
+        """
+        Store cache entries in a single transaction.
+
+        Args:
+            entries: Iterable of entries built with make_entry
+        """
+        entries = list(entries)
+        if not entries:
+            return
+        try:
+            connection = self._connect()
+            connection.execute("BEGIN")
+            try:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?)", entries
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update metadata cache {self.cache_file}: {e}")
+
+    def prune(self, directory):
+        """
+        Remove entries for files under a directory that no longer exist.
+
+        Args:
+            directory: Directory whose entries are checked
+
+        Returns:
+            Number of entries removed
+        """
+        prefix = os.path.join(os.path.abspath(str(directory)), "")
+        try:
+            connection = self._connect()
+            paths = connection.execute(
+                "SELECT path FROM metadata WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+            ).fetchall()
+            missing = [(path,) for (path,) in paths if not os.path.exists(path)]
+            if missing:
+                connection.execute("BEGIN")
+                try:
+                    connection.executemany("DELETE FROM metadata WHERE path = ?", missing)
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+                connection.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.warning(f"Could not prune metadata cache {self.cache_file}: {e}")
+            return 0
+        return len(missing)
+
+    def clear(self):
+        """Remove every entry and give the freed space back to the file system."""
+        try:
+            connection = self._connect()
+            connection.execute("DELETE FROM metadata")
+            connection.execute("VACUUM")
+        except sqlite3.Error as e:
+            logger.warning(f"Could not clear metadata cache {self.cache_file}: {e}")
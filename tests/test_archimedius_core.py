@@ -3,9 +3,26 @@
 Unit tests for core Archimedius behavior.
 """
 
+import errno
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
 import pytest
 
-from archimedius import Archimedius
+import archimedius
+from archimedius import (
+    Archimedius,
+    ScanProgress,
+    copy_file,
+    is_copy_current,
+    move_file,
+    plan_file,
+    worker_log_forwarding,
+)
 
 
 def test_template_management_updates_expected_media_type():
@@ -54,3 +71,381 @@ def test_stop_sets_stop_requested_flag():
     organizer.stop()
 
     assert organizer.stop_requested is True
+
+
+def test_find_media_files_walks_tree_once_and_skips_nested_output(tmp_path):
+    source = tmp_path / "source"
+    output = source / "organized"
+    (source / "albums" / "disc1").mkdir(parents=True)
+    output.mkdir()
+    (source / "song.MP3").write_bytes(b"")
+    (source / "albums" / "disc1" / "track.flac").write_bytes(b"")
+    (source / "albums" / "notes.txt").write_bytes(b"")
+    (output / "already.mp3").write_bytes(b"")
+
+    organizer = Archimedius()
+    organizer.set_source_dir(source)
+    organizer.set_output_dir(output)
+
+    found = organizer.find_media_files({".mp3", ".flac"})
+
+    assert sorted(path.name for path in found) == ["song.MP3", "track.flac"]
+    assert organizer.total_files == 2
+    assert organizer.is_output_inside_source() is True
+
+
+def test_find_media_files_descends_into_directories_named_like_media(tmp_path):
+    (tmp_path / "Live.mp3").mkdir()
+    (tmp_path / "Live.mp3" / "track.mp3").write_bytes(b"")
+    (tmp_path / ".mp3").write_bytes(b"")
+
+    organizer = Archimedius()
+    organizer.set_source_dir(tmp_path)
+
+    found = organizer.find_media_files({".mp3"})
+
+    assert [path.name for path in found] == ["track.mp3"]
+
+
+def test_find_media_files_skips_resource_forks_and_special_files(tmp_path):
+    (tmp_path / "track.mp3").write_bytes(b"")
+    (tmp_path / "._track.mp3").write_bytes(b"")
+    if hasattr(os, "mkfifo"):
+        os.mkfifo(tmp_path / "pipe.mp3")
+
+    organizer = Archimedius()
+    organizer.set_source_dir(tmp_path)
+
+    assert [path.name for path in organizer.find_media_files({".mp3"})] == ["track.mp3"]
+
+
+def test_find_media_files_does_not_scan_nested_output(tmp_path, monkeypatch):
+    output = tmp_path / "organized"
+    (output / "Artist").mkdir(parents=True)
+    (output / "Artist" / "song.mp3").write_bytes(b"")
+
+    organizer = Archimedius()
+    organizer.set_source_dir(tmp_path)
+    organizer.set_output_dir(output)
+
+    scanned = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        scanned.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+
+    assert organizer.find_media_files({".mp3"}) == []
+    assert scanned == [str(tmp_path)]
+
+
+def test_output_skip_prefix_only_set_for_nested_output(tmp_path):
+    organizer = Archimedius()
+    organizer.set_source_dir(tmp_path)
+    organizer.set_output_dir(tmp_path / "organized")
+
+    assert organizer.output_skip_prefix() == os.path.join(str(tmp_path), "organized", "")
+
+    organizer.set_output_dir(tmp_path)
+    assert organizer.output_skip_prefix() is None
+
+    # A sibling that merely shares the name prefix is not inside the source
+    organizer.set_source_dir(tmp_path / "music")
+    organizer.set_output_dir(tmp_path / "music2")
+    assert organizer.output_skip_prefix() is None
+
+
+def test_output_relation_is_resolved_once_per_directory_pair(tmp_path, monkeypatch):
+    organizer = Archimedius()
+    organizer.set_source_dir(tmp_path)
+    organizer.set_output_dir(tmp_path / "organized")
+    resolved = []
+    real_resolve = Path.resolve
+    monkeypatch.setattr(Path, "resolve", lambda self: resolved.append(self) or real_resolve(self))
+
+    assert organizer.is_output_inside_source()
+    assert organizer.output_skip_prefix() == os.path.join(str(tmp_path), "organized", "")
+    assert len(resolved) == 2
+
+    organizer.set_output_dir(tmp_path.parent)
+    assert not organizer.is_output_inside_source()
+    assert len(resolved) == 4
+
+
+def test_iter_media_files_counts_discovered_files_and_sets_total_when_done(tmp_path):
+    (tmp_path / "a.mp3").write_bytes(b"")
+    (tmp_path / "b.mp3").write_bytes(b"")
+
+    organizer = Archimedius()
+    organizer.set_source_dir(tmp_path)
+    progress = ScanProgress()
+    files = organizer.iter_media_files({".mp3"}, progress)
+
+    assert isinstance(next(files), str)
+    assert progress.files_discovered == 1
+    assert progress.total_files is None
+
+    assert len(list(files)) == 1
+    assert progress.files_discovered == 2
+    assert progress.total_files == 2
+
+
+def test_interleaved_walks_keep_their_own_counts(tmp_path):
+    # e.g. a preview scanning the source while an organize run is still walking it
+    for name in ("a.mp3", "b.mp3", "c.mp3"):
+        (tmp_path / name).write_bytes(b"")
+    organizer = Archimedius()
+    organizer.set_source_dir(tmp_path)
+    run_progress = ScanProgress()
+    run_files = organizer.iter_media_files({".mp3"}, run_progress)
+
+    next(run_files)
+    preview_progress = ScanProgress()
+    assert len(list(organizer.iter_media_files({".mp3"}, preview_progress))) == 3
+    assert run_progress.files_discovered == 1
+    assert run_progress.total_files is None
+
+    assert len(list(run_files)) == 2
+    assert run_progress.total_files == 3
+    assert preview_progress.total_files == 3
+
+
+def test_copy_file_copies_data_and_modification_time(tmp_path):
+    src = tmp_path / "song.mp3"
+    src.write_bytes(b"ID3" + bytes(range(256)) * 64)
+    os.utime(src, (1_600_000_000, 1_600_000_000))
+    dst = tmp_path / "copy.mp3"
+
+    copy_file(src, dst)
+
+    assert dst.read_bytes() == src.read_bytes()
+    assert dst.stat().st_mtime == src.stat().st_mtime
+
+
+def test_copy_file_applies_given_source_stat(tmp_path):
+    src = tmp_path / "song.mp3"
+    src.write_bytes(b"data")
+    os.utime(src, (1_600_000_000, 1_600_000_000))
+    src.chmod(0o640)
+    dst = tmp_path / "copy.mp3"
+
+    copy_file(src, dst, src.stat())
+
+    assert dst.read_bytes() == b"data"
+    assert dst.stat().st_mtime == 1_600_000_000
+    assert dst.stat().st_mode & 0o777 == 0o640
+
+
+def test_copy_file_stops_trying_copy_file_range_when_unavailable(tmp_path, monkeypatch):
+    src = tmp_path / "song.mp3"
+    src.write_bytes(b"data")
+    calls = []
+
+    def unavailable(*args):
+        calls.append(args)
+        raise OSError(errno.ENOSYS, "Function not implemented")
+
+    monkeypatch.setattr(os, "copy_file_range", unavailable, raising=False)
+    monkeypatch.setattr(archimedius, "_use_copy_file_range", True)
+
+    copy_file(src, tmp_path / "a.mp3")
+    copy_file(src, tmp_path / "b.mp3")
+
+    assert len(calls) == 1
+    assert (tmp_path / "b.mp3").read_bytes() == b"data"
+
+
+def test_is_copy_current_matches_earlier_copy_only(tmp_path):
+    src = tmp_path / "song.mp3"
+    src.write_bytes(b"data")
+    dst = tmp_path / "copy.mp3"
+
+    assert not is_copy_current(dst, os.stat(src))
+
+    copy_file(src, dst)
+    assert is_copy_current(dst, os.stat(src))
+
+    src.write_bytes(b"longer data")
+    assert not is_copy_current(dst, os.stat(src))
+    assert not is_copy_current(dst, None)
+
+
+def test_move_file_renames_on_same_filesystem(tmp_path):
+    src = tmp_path / "song.mp3"
+    src.write_bytes(b"data")
+    dst = tmp_path / "Artist" / "song.mp3"
+    dst.parent.mkdir()
+
+    move_file(src, dst)
+
+    assert not src.exists()
+    assert dst.read_bytes() == b"data"
+
+
+def test_move_file_overwrites_existing_destination(tmp_path):
+    src = tmp_path / "song.mp3"
+    src.write_bytes(b"new")
+    dst = tmp_path / "moved.mp3"
+    dst.write_bytes(b"old")
+
+    move_file(src, dst)
+
+    assert not src.exists()
+    assert dst.read_bytes() == b"new"
+
+
+def test_move_file_copies_across_devices(tmp_path, monkeypatch):
+    src = tmp_path / "song.mp3"
+    src.write_bytes(b"data")
+    dst = tmp_path / "moved.mp3"
+
+    def cross_device_replace(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "replace", cross_device_replace)
+    move_file(src, dst)
+
+    assert not src.exists()
+    assert dst.read_bytes() == b"data"
+
+
+def test_ensure_dir_creates_each_directory_once(tmp_path, monkeypatch):
+    organizer = Archimedius()
+    organizer.set_output_dir(tmp_path)
+    calls = []
+    real_makedirs = os.makedirs
+    monkeypatch.setattr(
+        os,
+        "makedirs",
+        lambda path, exist_ok=False: calls.append(path) or real_makedirs(path, exist_ok=exist_ok),
+    )
+
+    organizer.ensure_dir(tmp_path / "Rock" / "Album")
+    calls_after_first = len(calls)
+    organizer.ensure_dir(tmp_path / "Rock" / "Album")
+
+    assert (tmp_path / "Rock" / "Album").is_dir()
+    assert calls_after_first > 0
+    assert len(calls) == calls_after_first
+
+
+def test_ensure_dir_creates_sibling_with_single_mkdir(tmp_path, monkeypatch):
+    organizer = Archimedius()
+    organizer.set_output_dir(tmp_path)
+    organizer.ensure_dir(tmp_path / "Rock" / "Album")
+    makedirs_calls = []
+    monkeypatch.setattr(os, "makedirs", lambda *args, **kwargs: makedirs_calls.append(args))
+
+    organizer.ensure_dir(tmp_path / "Rock" / "Live")
+    organizer.ensure_dir(tmp_path / "Rock" / "Live")
+
+    assert (tmp_path / "Rock" / "Live").is_dir()
+    assert makedirs_calls == []
+
+
+def test_device_slot_limits_only_rotational_devices(tmp_path, monkeypatch):
+    monkeypatch.setattr(archimedius, "is_rotational_device", lambda device: device == 1)
+    organizer = Archimedius()
+    hdd_stat = os.stat_result((0o100644, 0, 1, 1, 0, 0, 0, 0, 0, 0))
+    ssd_stat = os.stat_result((0o100644, 0, 2, 1, 0, 0, 0, 0, 0, 0))
+
+    slot = organizer.device_slot(hdd_stat)
+    assert organizer.device_slot(hdd_stat) is slot
+    with slot:
+        assert not slot.acquire(blocking=False)
+    with organizer.device_slot(ssd_stat), organizer.device_slot(None):
+        pass
+
+
+def test_destination_lock_copies_sources_with_the_same_destination_one_at_a_time(tmp_path):
+    # e.g. "{creation_year}/{filename}" gives same-named files in two folders one destination
+    sources = [tmp_path / "a" / "song.mp3", tmp_path / "b" / "song.mp3"]
+    for index, source in enumerate(sources):
+        source.parent.mkdir()
+        source.write_bytes(bytes([index]) * 256 * 1024)
+    output = tmp_path / "organized"
+    output.mkdir()
+    organizer = Archimedius()
+    writers = []
+    overlapped = []
+
+    def transfer(source, dest_path):
+        with organizer.destination_lock(dest_path):
+            writers.append(source)
+            overlapped.append(len(writers) > 1)
+            time.sleep(0.05)
+            copy_file(source, dest_path)
+            writers.remove(source)
+
+    dest_paths = [str(output / "song.mp3"), str(output / "." / "song.mp3")]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(transfer, sources, dest_paths))
+
+    assert overlapped == [False, False]
+    assert (output / "song.mp3").read_bytes() in [source.read_bytes() for source in sources]
+    # Locks are only kept while a destination is being written
+    assert organizer._destination_locks == {}
+
+
+def test_create_parent_dirs_creates_each_unique_parent(tmp_path):
+    organizer = Archimedius()
+    organizer.set_output_dir(tmp_path)
+
+    organizer.create_parent_dirs(
+        [
+            tmp_path / "Rock" / "Album" / "01.mp3",
+            tmp_path / "Rock" / "Album" / "02.mp3",
+            tmp_path / "Jazz" / "03.mp3",
+        ]
+    )
+
+    assert (tmp_path / "Rock" / "Album").is_dir()
+    assert (tmp_path / "Jazz").is_dir()
+
+
+def test_plan_file_runs_in_worker_process(tmp_path):
+    file_path = tmp_path / "song.mp3"
+    file_path.write_bytes(b"")
+
+    with ProcessPoolExecutor(max_workers=1) as planner:
+        rel_path, file_stat, cache_entry = planner.submit(
+            plan_file,
+            str(file_path),
+            {"audio": [".mp3"]},
+            {".mp3": "audio"},
+            {},
+            {"audio": "{file_type}/{artist}"},
+            {"audio": True},
+        ).result()
+
+    assert rel_path == os.path.join("audio", "song.mp3")
+    assert file_stat.st_size == 0
+    assert cache_entry is None
+
+
+def test_errors_logged_in_worker_processes_reach_parent_handlers(tmp_path, caplog):
+    book = tmp_path / "broken.epub"
+    book.write_bytes(b"not a zip archive")
+
+    # Spawned workers, as the GUI uses, start with no logging setup of their own
+    mp_context = multiprocessing.get_context("spawn")
+    with caplog.at_level(logging.INFO):
+        with worker_log_forwarding(mp_context) as log_forwarding, ProcessPoolExecutor(
+            max_workers=1, mp_context=mp_context, **log_forwarding
+        ) as planner:
+            planner.submit(
+                plan_file,
+                str(book),
+                {"ebook": [".epub"]},
+                {".epub": "ebook"},
+                {},
+                {"audio": "{title}"},
+                {},
+            ).result()
+
+    assert any(
+        record.name == "MediaOrganizer" and "Error extracting EPUB metadata" in record.getMessage()
+        for record in caplog.records
+    )
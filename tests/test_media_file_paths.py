@@ -4,9 +4,14 @@ Unit tests for MediaFile type detection and path formatting behavior.
 """
 
 import os
+import sys
+import types
+import zipfile
+from datetime import datetime
 
 import extensions
-from media_file import MediaFile
+import media_file
+from media_file import MediaFile, get_template_fields
 
 
 def test_detects_file_type_case_insensitive_extension():
@@ -24,6 +29,14 @@ def test_unknown_extension_maps_to_unknown_type():
     assert media.metadata["filename"] == "notes"
 
 
+def test_extension_map_prefers_first_media_type_and_matches_file_type():
+    extension_map = extensions.get_extension_map({"audio": [".MP3"], "video": [".mp3", ".mp4"]})
+
+    assert extension_map == {".mp3": "audio", ".mp4": "video"}
+    media = MediaFile("clip.MP4", extensions.DEFAULT_EXTENSIONS, extension_map)
+    assert media.file_type == "video"
+
+
 def test_get_formatted_path_sanitizes_reserved_characters_in_metadata():
     media = MediaFile("song.mp3", extensions.DEFAULT_EXTENSIONS)
     media.file_type = "audio"
@@ -66,3 +79,221 @@ def test_get_formatted_path_adds_extension_when_template_has_filename_only():
     formatted = media.get_formatted_path("{filename}")
 
     assert formatted == "clip.mp4"
+
+
+def test_get_formatted_path_falls_back_to_file_name_when_metadata_is_incomplete():
+    media = MediaFile("track.mp3", extensions.DEFAULT_EXTENSIONS)
+    media.metadata.pop("filename_with_extension", None)
+    media.metadata.pop("extension", None)
+
+    formatted = media.get_formatted_path("{album}", exclude_unknown=True)
+
+    assert formatted == os.path.join("audio", "track.mp3")
+
+
+def test_get_formatted_path_treats_blank_metadata_as_unknown():
+    media = MediaFile("song.mp3", extensions.DEFAULT_EXTENSIONS)
+    media.metadata.update({"artist": "   ", "album": "Blue"})
+
+    assert media.get_formatted_path("{artist}/{album}") == os.path.join(
+        "Unknown", "Blue", "song.mp3"
+    )
+    assert media.get_formatted_path("{artist}/{album}", exclude_unknown=True) == os.path.join(
+        "Blue", "song.mp3"
+    )
+
+
+def test_get_formatted_path_keeps_braces_in_values_and_repeats_placeholders():
+    media = MediaFile("song.mp3", extensions.DEFAULT_EXTENSIONS)
+    media.metadata.update({"artist": "{album}", "album": "Blue"})
+
+    assert media.get_formatted_path("{album}/{artist}-{album}") == os.path.join(
+        "Blue", "{album}-Blue", "song.mp3"
+    )
+
+
+def test_tags_are_not_read_when_template_only_uses_file_information():
+    fields_by_type = {"audio": get_template_fields("{creation_year}/{filename}")}
+
+    media = MediaFile("song.mp3", extensions.DEFAULT_EXTENSIONS, None, fields_by_type)
+
+    assert "artist" not in media.metadata
+    assert media.metadata["filename"] == "song"
+
+    fields_by_type = {"audio": get_template_fields("{artist}/{filename}")}
+    media = MediaFile("song.mp3", extensions.DEFAULT_EXTENSIONS, None, fields_by_type)
+    assert media.metadata["artist"] == "Unknown"
+
+
+def test_audio_stream_is_only_read_when_template_uses_it(tmp_path, monkeypatch):
+    song = tmp_path / "song.mp3"
+    song.write_bytes(b"")
+    calls = []
+
+    class FakeTinyTag:
+        @staticmethod
+        def get(path, duration=True):
+            calls.append(duration)
+            raise OSError("not an mp3")
+
+    monkeypatch.setattr(media_file, "TinyTag", FakeTinyTag)
+
+    MediaFile(song, extensions.DEFAULT_EXTENSIONS, None, {"audio": get_template_fields("{artist}")})
+    MediaFile(song, extensions.DEFAULT_EXTENSIONS, None, {"audio": get_template_fields("{duration}")})
+    MediaFile(song, extensions.DEFAULT_EXTENSIONS)
+
+    assert calls == [False, True, True]
+
+
+def test_ebook_metadata_is_read_by_extension(tmp_path):
+    book = tmp_path / "book.EPUB"
+    with zipfile.ZipFile(book, "w") as epub:
+        epub.writestr(
+            "content.opf",
+            '<package xmlns="http://www.idpf.org/2007/opf"'
+            ' xmlns:dc="http://purl.org/dc/elements/1.1/"><metadata>'
+            "<dc:title>Dune</dc:title><dc:creator>Frank Herbert</dc:creator>"
+            "<dc:date>1965-08-01</dc:date></metadata></package>",
+        )
+
+    media = MediaFile(book, extensions.DEFAULT_EXTENSIONS)
+
+    assert media.file_type == "ebook"
+    assert media.metadata["title"] == "Dune"
+    assert media.metadata["author"] == "Frank Herbert"
+    assert media.metadata["year"] == "1965"
+
+
+def test_epub_package_is_found_through_container_file(tmp_path):
+    book = tmp_path / "book.epub"
+    with zipfile.ZipFile(book, "w") as epub:
+        epub.writestr(
+            "META-INF/container.xml",
+            '<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+            '<rootfile full-path="OEBPS/book.opf"/></rootfiles></container>',
+        )
+        epub.writestr("old/unused.opf", "<package/>")
+        epub.writestr(
+            "OEBPS/book.opf",
+            '<package xmlns="http://www.idpf.org/2007/opf"'
+            ' xmlns:dc="http://purl.org/dc/elements/1.1/"><metadata>'
+            "<dc:title>Emma</dc:title><dc:identifier>urn:isbn:9780141439587</dc:identifier>"
+            "</metadata><manifest/></package>",
+        )
+
+    media = MediaFile(book, extensions.DEFAULT_EXTENSIONS)
+
+    assert media.metadata["title"] == "Emma"
+    assert media.metadata["isbn"] == "urn:isbn:9780141439587"
+
+
+def test_fb2_metadata_is_read_from_title_info(tmp_path):
+    book = tmp_path / "book.fb2"
+    book.write_text(
+        '<FictionBook xmlns="http://www.gribuser.ru/xml/fictionbook/2.0"><description>'
+        "<title-info><genre>sf</genre><author><first-name>Stanislaw</first-name>"
+        "<last-name>Lem</last-name></author><book-title>Solaris</book-title>"
+        '<date value="1961-01-01">1961</date><lang>pl</lang></title-info>'
+        "<document-info><author><nickname>scanner</nickname></author></document-info>"
+        "</description><body/></FictionBook>",
+        encoding="utf-8",
+    )
+
+    media = MediaFile(book, extensions.DEFAULT_EXTENSIONS)
+
+    assert media.metadata["title"] == "Solaris"
+    assert media.metadata["author"] == "Stanislaw Lem"
+    assert media.metadata["genre"] == "sf"
+    assert media.metadata["language"] == "pl"
+    assert media.metadata["year"] == "1961"
+
+
+def _write_pdf(path, info):
+    """Write a minimal PDF with a classic cross-reference table and the given Info dictionary."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b"<< /Type /Pages /Kids [] /Count 0 >>", info]
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size 4 /Root 1 0 R /Info 3 0 R >>\nstartxref\n%d\n%%%%EOF\n" % xref_offset
+    path.write_bytes(data)
+
+
+def test_pdf_metadata_is_read_from_trailer_info(tmp_path):
+    book = tmp_path / "book.pdf"
+    _write_pdf(
+        book,
+        b"<< /Title (Moby \\(Dick\\)) /Author <FEFF00480065006C00E8006E0065> "
+        b"/Producer (Press\\051) /CreationDate (D:18511018120000Z) >>",
+    )
+
+    media = MediaFile(book, extensions.DEFAULT_EXTENSIONS)
+
+    assert media.metadata["title"] == "Moby (Dick)"
+    assert media.metadata["author"] == "Hel\u00e8ne"
+    assert media.metadata["publisher"] == "Press)"
+    assert media.metadata["year"] == "1851"
+
+
+def test_pdf_info_needing_a_full_parser_is_left_to_pypdf(tmp_path):
+    book = tmp_path / "book.pdf"
+    _write_pdf(book, b"<< /Title 4 0 R >>")
+
+    assert media_file._read_pdf_info(book) is None
+
+
+def test_epub_metadata_matches_elements_by_local_name(tmp_path):
+    book = tmp_path / "book.epub"
+    with zipfile.ZipFile(book, "w") as epub:
+        epub.writestr(
+            "content.opf",
+            '<package xmlns="http://www.idpf.org/2007/opf"'
+            ' xmlns:dc="http://purl.org/dc/elements/1.0/"><metadata><dc-metadata>'
+            "<dc:title>Ulysses</dc:title><dc:title>Subtitle</dc:title>"
+            "<dc:language>en</dc:language></dc-metadata></metadata>"
+            "<manifest><title>Not metadata</title></manifest></package>",
+        )
+
+    media = MediaFile(book, extensions.DEFAULT_EXTENSIONS)
+
+    assert media.metadata["title"] == "Ulysses"
+    assert media.metadata["language"] == "en"
+
+
+def test_creation_date_fields_come_from_the_file_ctime(tmp_path):
+    song = tmp_path / "song.mp3"
+    song.write_bytes(b"")
+    created = datetime.fromtimestamp(os.stat(song).st_ctime)
+
+    media = MediaFile(song, extensions.DEFAULT_EXTENSIONS, None, {"audio": frozenset()})
+
+    assert media.metadata["creation_date"] == created.strftime("%Y-%m-%d")
+    assert media.metadata["creation_year"] == created.strftime("%Y")
+    assert media.metadata["creation_month"] == created.strftime("%m")
+    assert media.metadata["creation_month_name"] == created.strftime("%B")
+
+
+def test_pdf_info_skips_nested_dictionaries_and_arrays(tmp_path):
+    book = tmp_path / "book.pdf"
+    _write_pdf(book, b"<< /Foo << /A 1 /Title (Inner) >> /Bar [/Title (Listed)] /Title (Outer) >>")
+
+    assert media_file._read_pdf_info(book) == {"/Title": "Outer"}
+
+
+def test_pdf_without_usable_trailer_info_falls_back_to_pypdf(tmp_path, monkeypatch):
+    book = tmp_path / "book.pdf"
+    _write_pdf(book, b"<< /Custom (value) >>")
+
+    class FakePdfReader:
+        def __init__(self, path):
+            self.metadata = {"/Title": "From pypdf"}
+
+    monkeypatch.setitem(sys.modules, "pypdf", types.SimpleNamespace(PdfReader=FakePdfReader))
+
+    media = MediaFile(book, extensions.DEFAULT_EXTENSIONS)
+
+    assert media.metadata["title"] == "From pypdf"
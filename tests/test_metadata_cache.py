@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SQLite metadata cache.
+"""
+
+import os
+import sqlite3
+from types import SimpleNamespace
+
+import extensions
+import media_file
+from media_file import MediaFile, get_template_fields
+from metadata_cache import MetadataCache
+
+
+def test_cache_returns_stored_metadata_until_file_changes(tmp_path):
+    song = tmp_path / "song.mp3"
+    song.write_bytes(b"data")
+    cache = MetadataCache(tmp_path / "metadata.cache")
+    needed = frozenset(("artist",))
+
+    assert cache.get(song, os.stat(song), needed, "1") is None
+
+    cache.put_many(
+        [cache.make_entry(song, os.stat(song), needed, {"artist": "Ann", "year": 1999}, "1")]
+    )
+    assert cache.get(song, os.stat(song), needed, "1") == {"artist": "Ann", "year": "1999"}
+    # Entries written by another version are not used
+    assert cache.get(song, os.stat(song), needed, "2") is None
+
+    song.write_bytes(b"longer data")
+    assert cache.get(song, os.stat(song), needed, "1") is None
+
+
+def test_cache_misses_when_more_fields_are_needed_than_were_read(tmp_path):
+    song = tmp_path / "song.mp3"
+    song.write_bytes(b"data")
+    cache = MetadataCache(tmp_path / "metadata.cache")
+    cache.put_many(
+        [cache.make_entry(song, os.stat(song), frozenset(("artist",)), {"artist": "Ann"}, "1")]
+    )
+
+    assert cache.get(song, os.stat(song), frozenset(("artist", "duration")), "1") is None
+    assert cache.get(song, os.stat(song), None, "1") is None
+
+    cache.put_many([cache.make_entry(song, os.stat(song), None, {"artist": "Ann"}, "1")])
+    assert cache.get(song, os.stat(song), frozenset(("artist", "duration")), "1") == {
+        "artist": "Ann"
+    }
+
+
+def test_prune_and_clear_remove_entries(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    kept = source / "kept.mp3"
+    gone = source / "gone.mp3"
+    outside = tmp_path / "outside.mp3"
+    for path in (kept, gone, outside):
+        path.write_bytes(b"data")
+    cache = MetadataCache(tmp_path / "metadata.cache")
+    cache.put_many(
+        [cache.make_entry(path, os.stat(path), None, {}, "1") for path in (kept, gone, outside)]
+    )
+    stats = {path: os.stat(path) for path in (kept, outside)}
+    gone.unlink()
+    outside.unlink()
+
+    assert cache.prune(source) == 1
+    assert cache.get(kept, stats[kept], None, "1") == {}
+    # Only entries under the pruned directory are checked
+    assert cache.get(outside, stats[outside], None, "1") == {}
+
+    cache.clear()
+    assert cache.get(kept, stats[kept], None, "1") is None
+
+
+def test_cache_written_with_an_older_layout_is_replaced(tmp_path):
+    cache_file = tmp_path / "metadata.cache"
+    connection = sqlite3.connect(cache_file)
+    connection.execute(
+        "CREATE TABLE metadata (path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, "
+        "fields TEXT, json TEXT)"
+    )
+    connection.commit()
+    connection.close()
+    song = tmp_path / "song.mp3"
+    song.write_bytes(b"data")
+    cache = MetadataCache(cache_file)
+
+    cache.put_many([cache.make_entry(song, os.stat(song), None, {"artist": "Ann"}, "1")])
+
+    assert cache.get(song, os.stat(song), None, "1") == {"artist": "Ann"}
+
+
+def _fake_tinytag(reads, fail):
+    """Build a TinyTag stand-in that records reads and optionally fails."""
+
+    class FakeTinyTag:
+        @staticmethod
+        def get(path, duration=True):
+            reads.append(path)
+            if fail:
+                raise OSError("not an mp3")
+            return SimpleNamespace(
+                title=None,
+                artist="Ann",
+                album=None,
+                year=None,
+                genre=None,
+                track=None,
+                duration=None,
+                bitrate=None,
+                samplerate=None,
+            )
+
+    return FakeTinyTag
+
+
+def test_media_file_reads_contents_only_on_cache_miss(tmp_path, monkeypatch):
+    song = tmp_path / "song.mp3"
+    song.write_bytes(b"")
+    cache = MetadataCache(tmp_path / "metadata.cache")
+    fields_by_type = {"audio": get_template_fields("{artist}")}
+    reads = []
+    monkeypatch.setattr(media_file, "TinyTag", _fake_tinytag(reads, fail=False))
+
+    first = MediaFile(song, extensions.DEFAULT_EXTENSIONS, None, fields_by_type, cache)
+    cache.put_many([first.cache_entry])
+    second = MediaFile(song, extensions.DEFAULT_EXTENSIONS, None, fields_by_type, cache)
+
+    assert len(reads) == 1
+    assert second.cache_entry is None
+    assert second.metadata["artist"] == "Ann"
+    assert second.metadata["filename"] == "song"
+
+
+def test_failed_extraction_is_not_cached(tmp_path, monkeypatch):
+    song = tmp_path / "song.mp3"
+    song.write_bytes(b"")
+    cache = MetadataCache(tmp_path / "metadata.cache")
+    fields_by_type = {"audio": get_template_fields("{artist}")}
+    monkeypatch.setattr(media_file, "TinyTag", _fake_tinytag([], fail=True))
+
+    media = MediaFile(song, extensions.DEFAULT_EXTENSIONS, None, fields_by_type, cache)
+
+    assert media.metadata["artist"] == "Unknown"
+    assert media.cache_entry is None